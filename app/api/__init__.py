@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 
 from app.api.routes.employee import employee
+from app.api.routes.internal import internal
 from app.api.routes.login import login
 from app.api.routes.product import prodcuts
 from app.api.routes.schedule import schedule
@@ -18,6 +19,7 @@ def init_routers(app: FastAPI) -> None:
     app.include_router(schedule)
     app.include_router(service)
     app.include_router(slots)
+    app.include_router(internal)
 
 
 __all__ = ['init_routers']
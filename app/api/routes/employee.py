@@ -5,7 +5,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.depency import get_db
+from app.core.exception.exceptions import AppException
+from app.db.depency import get_db, get_read_db
 from app.schemas.employee import (
     EmployeeBase,
     EmployeeDeleteOut,
@@ -42,7 +43,7 @@ async def add_employee(
 )
 async def list_employees(
     pagination: PaginationParams = Depends(),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     try:
         employees, metadata = await EmployeeService(
@@ -51,6 +52,8 @@ async def list_employees(
         return {'data': employees, 'metadata': metadata}
     except ValidationError as ve:
         raise HTTPException(status_code=422, detail=ve.errors())
+    except AppException:
+        raise
     except Exception:
         raise HTTPException(
             status_code=500,
@@ -63,7 +66,7 @@ async def list_employees(
     response_model=EmployeeGetIdOut,
     status_code=status.HTTP_200_OK,
 )
-async def get_employee(id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_employee(id: UUID, db: AsyncSession = Depends(get_read_db)):
     try:
         employee = await EmployeeService(session=db).get_employee(id)
         if not employee:
@@ -0,0 +1,27 @@
+# app/routes/internal.py
+from fastapi import APIRouter
+
+from app.core.utils.count_cache import count_cache
+from app.core.utils.pool_metrics import pool_metrics, statement_metrics
+from app.core.utils.singleflight import slot_flight
+from app.db.archive import archiver
+from app.db.replica import replica_monitor
+
+internal = APIRouter(prefix='/internal', tags=['internal'])
+
+
+@internal.get(
+    '/metrics',
+    description='Pool, cache and archiver metrics of this worker',
+    include_in_schema=False,
+)
+async def metrics():
+    # Cada worker do uvicorn tem o próprio pool e caches
+    return {
+        'pool': pool_metrics.stats(),
+        'statements': statement_metrics.stats(),
+        'slot_flight': slot_flight.stats(),
+        'count_cache': count_cache.stats(),
+        'archiver': archiver.stats(),
+        'replica': replica_monitor.stats(),
+    }
@@ -7,8 +7,9 @@ from fastapi.exceptions import HTTPException
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.exception.exceptions import AppException
 from app.core.utils.products import UploadImageProduct
-from app.db.depency import get_db
+from app.db.depency import get_db, get_read_db
 from app.schemas.pagination import PaginationParams
 from app.schemas.product import (
     ProductInSchema,
@@ -37,12 +38,13 @@ async def add_products(
     db: AsyncSession = Depends(get_db),
 ):
     try:
+        image_path = None
         if image:
             uploader = UploadImageProduct(
                 description=description,
                 created_at=datetime.now(),
             )
-            await uploader.save_image(image)
+            image_path = await uploader.save_image(image)
 
         # repassando o dict para o produto
         product_data = {
@@ -51,6 +53,7 @@ async def add_products(
             'time_to_spend': time_to_spend,
             'commission': commission,
             'category': category,
+            'image': image_path,
         }
 
         data = ProductInSchema(**product_data)
@@ -70,7 +73,7 @@ async def add_products(
 )
 async def list_products(
     pagination: PaginationParams = Depends(),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     try:
         products, metadata = await ProductsService(
@@ -80,6 +83,8 @@ async def list_products(
 
     except ValidationError as ve:
         raise HTTPException(status_code=422, detail=ve.errors())
+    except AppException:
+        raise
     except Exception:
         raise HTTPException(
             status_code=500,
@@ -92,7 +97,7 @@ async def list_products(
     description='Get product of id',
     status_code=status.HTTP_200_OK,
 )
-async def get_product(id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_product(id: UUID, db: AsyncSession = Depends(get_read_db)):
     try:
         return await ProductsService(session=db).get_product(id)
     except ValidationError as ve:
@@ -167,7 +172,7 @@ async def add_products_employe(
     status_code=status.HTTP_200_OK,
 )
 async def list_products_employee(
-    id: UUID, db: AsyncSession = Depends(get_db)
+    id: UUID, db: AsyncSession = Depends(get_read_db)
 ):
     try:
         products = await ProductEmployeeService(
@@ -6,9 +6,15 @@ from fastapi.exceptions import HTTPException
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.depency import get_db
-from app.schemas.pagination import PaginationParams
-from app.schemas.schedule import ScheduleInSchema, ScheduleOutSchema
+from app.core.exception.exceptions import AppException
+from app.db.depency import get_db, get_read_db
+from app.schemas.schedule import (
+    ScheduleBulkInSchema,
+    ScheduleBulkOutSchema,
+    ScheduleInSchema,
+    ScheduleListParams,
+    ScheduleOutSchema,
+)
 from app.service.schedule import ScheduleService
 
 schedule = APIRouter(prefix='/schedule', tags=['schedule'])
@@ -26,6 +32,8 @@ async def add_schedule(
         )
     except ValidationError as ve:
         raise HTTPException(status_code=422, detail=ve.errors())
+    except AppException:
+        raise
     except Exception:
         raise HTTPException(
             status_code=500,
@@ -33,12 +41,37 @@ async def add_schedule(
         )
 
 
+@schedule.post(
+    '/bulk',
+    description=(
+        'Add schedules in batch; returns the result of each item'
+    ),
+    response_model=ScheduleBulkOutSchema,
+)
+async def add_schedules_bulk(
+    data: ScheduleBulkInSchema, db: AsyncSession = Depends(get_db)
+):
+    try:
+        return await ScheduleService(session=db).register_schedules_bulk(
+            data=data
+        )
+    except ValidationError as ve:
+        raise HTTPException(status_code=422, detail=ve.errors())
+    except AppException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=500,
+            detail='Something went wrong while creating the schedules.',
+        )
+
+
 @schedule.get(
     '/manageruser',
     description='Get schedule of id',
 )
 async def get_schedule(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     id: int = Header(..., alias='Id'),
 ):
     try:
@@ -58,8 +91,8 @@ async def get_schedule(
     description='List all schedules',
 )
 async def list_schedules(
-    params: PaginationParams = Depends(),
-    db: AsyncSession = Depends(get_db),
+    params: ScheduleListParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
     try:
         users, metadata = await ScheduleService(session=db).list_schedules(
@@ -68,6 +101,8 @@ async def list_schedules(
         return {'data': users, 'metadata': metadata}
     except ValidationError as ve:
         raise HTTPException(status_code=422, detail=ve.errors())
+    except AppException:
+        raise
     except Exception:
         raise HTTPException(
             status_code=500,
@@ -89,6 +124,8 @@ async def update_schedule(
         )
     except ValidationError as ve:
         raise HTTPException(status_code=422, detail=ve.errors())
+    except AppException:
+        raise
     except Exception:
         raise HTTPException(
             status_code=500,
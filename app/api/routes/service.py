@@ -5,8 +5,8 @@ from fastapi.exceptions import HTTPException
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.depency import get_db
-from app.schemas.service import ScheduleInEmployee
+from app.db.depency import get_db, get_read_db
+from app.schemas.service import ScheduleInEmployee, WorkingHoursIn
 from app.service.services import ServiceSchedule
 
 service = APIRouter(prefix='/service', tags=['service'])
@@ -27,7 +27,7 @@ async def add_block(
 
 
 @service.get('/block', description='Get all block schedules')
-async def get_all_block(db: AsyncSession = Depends(get_db)):
+async def get_all_block(db: AsyncSession = Depends(get_read_db)):
     try:
         return await ServiceSchedule(session=db).get_all_block()
     except Exception:
@@ -44,3 +44,20 @@ async def delete_block(block_id: UUID, db: AsyncSession = Depends(get_db)):
         raise HTTPException(
             status_code=500, detail='Internal Server Error'
         )
+
+
+@service.post(
+    '/working-hours',
+    description='Set employee working hours for a weekday',
+)
+async def set_working_hours(
+    data: WorkingHoursIn, db: AsyncSession = Depends(get_db)
+):
+    try:
+        return await ServiceSchedule(session=db).set_working_hours(data)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=e.errors())
+    except Exception:
+        raise HTTPException(
+            status_code=500, detail='Internal Server Error'
+        )
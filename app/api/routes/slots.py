@@ -1,11 +1,20 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.depency import get_db
-from app.schemas.slots import SlotSchema, SlotsInSchema
+from app.core.exception.exceptions import AppException
+from app.db.depency import get_db, get_read_db
+from app.schemas.slots import (
+    NextSlotSchema,
+    NextSlotsInSchema,
+    OccupancyDiffSchema,
+    SlotsBatchInSchema,
+    SlotSchema,
+    SlotsInSchema,
+)
 from app.service.slots import SlotService
 
 slots = APIRouter(prefix='/slot', tags=['slot'])
@@ -17,14 +26,89 @@ slots = APIRouter(prefix='/slot', tags=['slot'])
     response_model=List[SlotSchema],
 )
 async def list_slots(
-    data: SlotsInSchema, db: AsyncSession = Depends(get_db)
+    data: SlotsInSchema, db: AsyncSession = Depends(get_read_db)
 ):
     try:
         return await SlotService(session=db).list_slots(data)
     except ValidationError as ve:
         raise HTTPException(status_code=422, detail=ve.errors())
+    except AppException:
+        raise
     except Exception:
         raise HTTPException(
             status_code=500,
             detail='Something went wrong while listing the slots.',
         )
+
+
+@slots.post(
+    '/next',
+    description=(
+        'Earliest free slots for a product across every employee who '
+        'performs it'
+    ),
+    response_model=List[NextSlotSchema],
+)
+async def first_available(
+    data: NextSlotsInSchema, db: AsyncSession = Depends(get_read_db)
+):
+    try:
+        return await SlotService(session=db).first_available(data)
+    except ValidationError as ve:
+        raise HTTPException(status_code=422, detail=ve.errors())
+    except AppException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=500,
+            detail='Something went wrong while searching the slots.',
+        )
+
+
+@slots.post(
+    '/batch',
+    description=(
+        'Stream available slots for several employees over a date range, '
+        'one JSON line per employee and day'
+    ),
+)
+async def list_slots_batch(
+    data: SlotsBatchInSchema, db: AsyncSession = Depends(get_read_db)
+):
+    try:
+        groups = await SlotService(session=db).list_slots_batch(data)
+    except ValidationError as ve:
+        raise HTTPException(status_code=422, detail=ve.errors())
+    except AppException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=500,
+            detail='Something went wrong while listing the slots.',
+        )
+
+    # As consultas já rodaram; o stream só calcula e serializa os dias
+    return StreamingResponse(
+        (f'{group.model_dump_json()}\n' for group in groups),
+        media_type='application/x-ndjson',
+    )
+
+
+@slots.get(
+    '/occupancy/check',
+    description=(
+        'Rebuild the cached occupancy bitmaps from the database and '
+        'report the days that diverged'
+    ),
+    response_model=List[OccupancyDiffSchema],
+)
+async def check_occupancy(db: AsyncSession = Depends(get_db)):
+    try:
+        return await SlotService(session=db).check_occupancy()
+    except AppException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=500,
+            detail='Something went wrong while checking the occupancy.',
+        )
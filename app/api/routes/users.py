@@ -5,7 +5,8 @@ from fastapi.exceptions import HTTPException
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.depency import get_db
+from app.core.exception.exceptions import AppException
+from app.db.depency import get_db, get_read_db
 from app.schemas.pagination import PaginationParams
 from app.schemas.users import (
     UserCreate,
@@ -36,13 +37,15 @@ async def add_users(data: UserCreate, db: AsyncSession = Depends(get_db)):
 @users.get('', description='List all users')
 async def list_users(
     pagination: PaginationParams = Depends(),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     try:
         users, metadata = await UserService(session=db).list_users(
             pagination
         )
         return {'data': users, 'metadata': metadata}
+    except AppException:
+        raise
     except Exception:
         raise HTTPException(
             status_code=500,
@@ -51,7 +54,7 @@ async def list_users(
 
 
 @users.get('/{id}', description='Get user of id')
-async def get_user(id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_user(id: UUID, db: AsyncSession = Depends(get_read_db)):
     try:
         return await UserService(session=db).get_user(id)
     except Exception:
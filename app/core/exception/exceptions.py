@@ -31,6 +31,29 @@ class InvalidPaginationError(AppException):
         )
 
 
+class ScheduleConflictError(AppException):
+    """Erro quando o horário já está reservado para o funcionário."""
+
+    def __init__(
+        self, detail: str = 'Horário já reservado para este funcionário'
+    ):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT, detail=detail
+        )
+
+
+class ScheduleCrossesMonthError(AppException):
+    """Erro quando o atendimento termina no mês seguinte ao do início."""
+
+    def __init__(
+        self,
+        detail: str = 'Agendamento não pode atravessar a virada do mês',
+    ):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=detail
+        )
+
+
 class ExceptionsValueErro(AppException):
     """Retonro de value erro para o sqlalchemy"""
 
@@ -0,0 +1,87 @@
+# app/core/utils/availability.py
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+Interval = Tuple[datetime, datetime]
+
+
+class IntervalIndex:
+    """Intervalos ocupados [start, end) ordenados e fundidos.
+
+    Os intervalos sobrepostos ou encostados são unidos na construção,
+    então cada consulta de sobreposição é um ``bisect`` em O(log n).
+    """
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        self._starts: List[datetime] = []
+        self._ends: List[datetime] = []
+        for start, end in sorted(intervals):
+            if end <= start:
+                continue
+            if self._ends and start <= self._ends[-1]:
+                if end > self._ends[-1]:
+                    self._ends[-1] = end
+                continue
+            self._starts.append(start)
+            self._ends.append(end)
+
+    @property
+    def starts(self) -> List[datetime]:
+        return self._starts
+
+    @property
+    def ends(self) -> List[datetime]:
+        return self._ends
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __iter__(self):
+        return iter(zip(self._starts, self._ends))
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """Indica se [start, end) cruza algum intervalo ocupado."""
+        i = bisect_right(self._starts, start) - 1
+        if i >= 0 and self._ends[i] > start:
+            return True
+        return i + 1 < len(self._starts) and self._starts[i + 1] < end
+
+
+class AvailabilityEngine:
+    """Calcula slots livres a partir dos intervalos ocupados."""
+
+    def __init__(self, busy: Iterable[Interval] = ()):
+        self.busy = IntervalIndex(busy)
+
+    def free_slots(
+        self,
+        window_start: datetime,
+        window_end: datetime,
+        slot_minutes: int,
+        length: Optional[timedelta] = None,
+    ) -> List[Dict[str, datetime]]:
+        """Varre a janela em passos de ``slot_minutes``.
+
+        Um slot começa em cada passo da grade e dura ``length`` (por
+        padrão, o próprio passo). A varredura anda junto com os
+        intervalos ocupados, já ordenados, e pula direto para o primeiro
+        passo após cada conflito: O(log n + slots + intervalos da janela).
+        """
+        step = timedelta(minutes=slot_minutes)
+        length = length or step
+        starts, ends = self.busy.starts, self.busy.ends
+        available = []
+        # Primeiro intervalo que ainda não terminou no início da janela
+        i = bisect_right(ends, window_start)
+        current = window_start
+        while current + length <= window_end:
+            while i < len(ends) and ends[i] <= current:
+                i += 1
+            if i < len(starts) and starts[i] < current + length:
+                steps = -(-(ends[i] - window_start) // step)
+                current = window_start + steps * step
+                continue
+            available.append({'start': current, 'end': current + length})
+            current += step
+        return available
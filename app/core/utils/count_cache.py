@@ -0,0 +1,53 @@
+# app/core/utils/count_cache.py
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+COUNT_TTL_SECONDS = 300
+
+
+class CountCache:
+    """Totais das listagens por (entidade, filtros).
+
+    As escritas de cada repositório chamam ``invalidate`` com a sua
+    entidade; o TTL cobre escritas de outros workers ou feitas direto
+    no banco.
+    """
+
+    def __init__(self, ttl_seconds: float = COUNT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._counts: Dict[Tuple[str, Hashable], Tuple[int, float]] = {}
+
+    def get(self, entity: str, filters: Hashable) -> Optional[int]:
+        entry = self._counts.get((entity, filters))
+        if entry is not None:
+            total, stored_at = entry
+            if time.monotonic() - stored_at < self.ttl_seconds:
+                self.hits += 1
+                return total
+            del self._counts[(entity, filters)]
+        self.misses += 1
+        return None
+
+    def put(self, entity: str, filters: Hashable, total: int) -> None:
+        self._counts[(entity, filters)] = (total, time.monotonic())
+
+    def invalidate(self, entity: Optional[str] = None) -> None:
+        if entity is None:
+            self._counts.clear()
+            return
+        for key in [k for k in self._counts if k[0] == entity]:
+            del self._counts[key]
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0,
+            'entries': len(self._counts),
+        }
+
+
+count_cache = CountCache()
@@ -0,0 +1,187 @@
+# app/core/utils/cursor.py
+import base64
+import binascii
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exception.exceptions import InvalidPaginationError
+from app.schemas.pagination import PaginationParams
+
+SORT_KEY = '_cursor_sort'
+ID_KEY = '_cursor_id'
+
+# Tipos que o JSON não representa: o cursor guarda {tag: texto}
+_LOADERS = {
+    'dt': datetime.fromisoformat,
+    'd': date.fromisoformat,
+    't': time.fromisoformat,
+    'td': lambda value: timedelta(seconds=float(value)),
+    'u': UUID,
+    'dec': Decimal,
+}
+
+
+def _dump(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    if isinstance(value, time):
+        return {'t': value.isoformat()}
+    if isinstance(value, timedelta):
+        return {'td': str(value.total_seconds())}
+    if isinstance(value, UUID):
+        return {'u': str(value)}
+    if isinstance(value, Decimal):
+        return {'dec': str(value)}
+    raise TypeError(f'Unsupported cursor value: {type(value)}')
+
+
+def _load(value: Any) -> Any:
+    if isinstance(value, dict):
+        ((tag, raw),) = value.items()
+        return _LOADERS[tag](raw)
+    return value
+
+
+def _ordering(params: PaginationParams) -> str:
+    return f'{params.order_by}:{(params.sort_by or "asc").lower()}'
+
+
+def encode_cursor(
+    direction: str, sort_value: Any, row_id: Any, params: PaginationParams
+) -> str:
+    payload = {
+        'd': direction,
+        'o': _ordering(params),
+        'k': [_dump(sort_value), _dump(row_id)],
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(
+    cursor: str, params: PaginationParams
+) -> Tuple[str, Any, Any]:
+    """Retorna (direção, valor de ordenação, id) do cursor."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        direction = payload['d']
+        sort_value, row_id = (_load(v) for v in payload['k'])
+        ordering = payload['o']
+    except (
+        binascii.Error,
+        ValueError,
+        KeyError,
+        TypeError,
+        UnicodeDecodeError,
+    ):
+        raise InvalidPaginationError('Cursor inválido')
+    if direction not in ('next', 'prev'):
+        raise InvalidPaginationError('Cursor inválido')
+    if ordering != _ordering(params):
+        raise InvalidPaginationError('Cursor gerado para outra ordenação')
+    return direction, sort_value, row_id
+
+
+def seek_predicate(
+    sort_column, id_column, sort_value: Any, row_id: Any, descending: bool
+):
+    """Linhas depois de (sort_value, row_id) na ordem da consulta.
+
+    Segue a ordem padrão do PostgreSQL para nulos: por último em ASC e
+    primeiro em DESC.
+    """
+
+    def after(column, value):
+        return column < value if descending else column > value
+
+    if sort_value is None:
+        tail = and_(sort_column.is_(None), after(id_column, row_id))
+        return or_(sort_column.is_not(None), tail) if descending else tail
+
+    seek = or_(
+        after(sort_column, sort_value),
+        and_(sort_column == sort_value, after(id_column, row_id)),
+    )
+    return seek if descending else or_(seek, sort_column.is_(None))
+
+
+async def fetch_cursor_page(
+    session: AsyncSession,
+    stmt: Select,
+    sort_column,
+    id_column,
+    params: PaginationParams,
+) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+    """
+    Busca uma página por keyset em vez de OFFSET.
+
+    A consulta é ordenada por (sort_column, id_column) e retoma depois
+    da chave guardada no cursor, então o custo não cresce com a
+    profundidade da página. O cursor "prev" percorre a ordem invertida
+    e a página é desvirada antes de retornar.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]: \
+        linhas, cursor da próxima página e cursor da anterior.
+    """
+    descending = (params.sort_by or 'asc').lower() == 'desc'
+    backwards = False
+    if params.cursor:
+        direction, sort_value, row_id = decode_cursor(
+            params.cursor, params
+        )
+        backwards = direction == 'prev'
+
+    query_desc = descending != backwards
+    stmt = stmt.add_columns(
+        sort_column.label(SORT_KEY), id_column.label(ID_KEY)
+    )
+    if params.cursor:
+        stmt = stmt.where(
+            seek_predicate(
+                sort_column, id_column, sort_value, row_id, query_desc
+            )
+        )
+    if query_desc:
+        order = (sort_column.desc(), id_column.desc())
+    else:
+        order = (sort_column.asc(), id_column.asc())
+    stmt = stmt.order_by(None).order_by(*order)
+
+    # Uma linha a mais indica se há página seguinte nessa direção
+    result = await session.execute(stmt.limit(params.rows_per_page + 1))
+    rows = [dict(row._mapping) for row in result.all()]
+    has_more = len(rows) > params.rows_per_page
+    rows = rows[: params.rows_per_page]
+    if backwards:
+        rows.reverse()
+
+    next_cursor = previous_cursor = None
+    if rows:
+        has_next = True if backwards else has_more
+        has_previous = has_more if backwards else bool(params.cursor)
+        first, last = rows[0], rows[-1]
+        if has_next:
+            next_cursor = encode_cursor(
+                'next', last[SORT_KEY], last[ID_KEY], params
+            )
+        if has_previous:
+            previous_cursor = encode_cursor(
+                'prev', first[SORT_KEY], first[ID_KEY], params
+            )
+
+    for row in rows:
+        row.pop(SORT_KEY)
+        row.pop(ID_KEY)
+    return rows, next_cursor, previous_cursor
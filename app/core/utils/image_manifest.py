@@ -0,0 +1,146 @@
+# app/core/utils/image_manifest.py
+import asyncio
+import json
+import os
+import sys
+import threading
+from typing import Dict, Optional
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+FOLDER_PREFIX = 'product_images_'
+URL_PATH_PREFIX = 'static/uploads'
+
+UPLOADS_DIR = os.path.normpath(
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        '..',
+        '..',
+        'static',
+        'uploads',
+    )
+)
+
+
+class ImageManifest:
+    """Índice persistente: descrição do produto -> caminho da imagem.
+
+    O manifesto é montado uma única vez (``build``) varrendo a árvore
+    ``static/uploads/YYYY/MM/DD`` e depois mantido incrementalmente por
+    ``register`` a cada upload. Consultas são O(1) em memória; o arquivo
+    JSON serve para compartilhar o índice entre os workers do uvicorn.
+    """
+
+    def __init__(
+        self,
+        uploads_dir: str = UPLOADS_DIR,
+        manifest_file: Optional[str] = None,
+    ):
+        self.uploads_dir = uploads_dir
+        self.manifest_file = manifest_file or os.path.join(
+            uploads_dir, 'manifest.json'
+        )
+        self._images: Dict[str, str] = {}
+        self._mtime: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def build(self) -> int:
+        """Varre a árvore de uploads e regrava o manifesto."""
+        images: Dict[str, str] = {}
+        for root, dirs, files in os.walk(self.uploads_dir):
+            # Ordem cronológica: o upload mais recente sobrescreve
+            dirs.sort()
+            folder = os.path.basename(root)
+            if not folder.startswith(FOLDER_PREFIX):
+                continue
+            image_files = sorted(
+                f for f in files if f.lower().endswith(IMAGE_EXTENSIONS)
+            )
+            if not image_files:
+                continue
+            relative_path = os.path.relpath(
+                os.path.join(root, image_files[0]), self.uploads_dir
+            ).replace(os.sep, '/')
+            description = folder[len(FOLDER_PREFIX) :]
+            images[description] = f'{URL_PATH_PREFIX}/{relative_path}'
+
+        with self._lock:
+            self._images = images
+            self._save()
+        return len(images)
+
+    def load(self) -> int:
+        """Carrega o manifesto do disco, montando-o se não existir."""
+        if not os.path.exists(self.manifest_file):
+            return self.build()
+        with self._lock:
+            self._read()
+        return len(self._images)
+
+    def refresh(self) -> None:
+        """Recarrega o manifesto se outro worker o alterou."""
+        try:
+            mtime = os.stat(self.manifest_file).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime != self._mtime:
+            with self._lock:
+                self._read()
+
+    def get(self, description: str) -> Optional[str]:
+        return self._images.get(description)
+
+    def as_dict(self) -> Dict[str, str]:
+        return dict(self._images)
+
+    def register(self, description: str, relative_path: str) -> None:
+        """Atualiza o manifesto após um upload."""
+        self.refresh()
+        with self._lock:
+            self._images[description] = relative_path
+            self._save()
+
+    def _read(self) -> None:
+        try:
+            with open(self.manifest_file, encoding='utf-8') as file:
+                self._images = json.load(file)
+            self._mtime = os.stat(self.manifest_file).st_mtime_ns
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._images = {}
+            self._mtime = None
+
+    def _save(self) -> None:
+        os.makedirs(self.uploads_dir, exist_ok=True)
+        tmp_file = f'{self.manifest_file}.{os.getpid()}.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as file:
+            json.dump(self._images, file, ensure_ascii=False)
+        os.replace(tmp_file, self.manifest_file)
+        self._mtime = os.stat(self.manifest_file).st_mtime_ns
+
+
+image_manifest = ImageManifest()
+
+
+async def backfill_products() -> int:
+    """Grava em finance.products os caminhos achados no disco."""
+    from app.db.db import AsyncSessionLocal
+    from app.repositories.products_repositories import ProductRepositories
+
+    image_manifest.build()
+    async with AsyncSessionLocal() as session:
+        return await ProductRepositories(session).backfill_image_paths(
+            image_manifest.as_dict()
+        )
+
+
+if __name__ == '__main__':
+    # python -m app.core.utils.image_manifest [rebuild|backfill]
+    command = sys.argv[1] if len(sys.argv) > 1 else 'rebuild'
+    if command == 'backfill':
+        total = asyncio.run(backfill_products())
+        sys.stdout.write(f'Backfilled image_path for {total} products\n')
+    else:
+        total = image_manifest.build()
+        sys.stdout.write(
+            f'Manifest rebuilt with {total} product images '
+            f'at {image_manifest.manifest_file}\n'
+        )
@@ -0,0 +1,199 @@
+# app/core/utils/occupancy.py
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from app.core.utils.availability import Interval
+
+GRANULARITY_MINUTES = 5
+BITS_PER_DAY = 24 * 60 // GRANULARITY_MINUTES
+OCCUPANCY_TTL_SECONDS = 60
+OCCUPANCY_MAX_DAYS = 20_000
+
+_STEP = timedelta(minutes=GRANULARITY_MINUTES)
+
+
+def _bit(day: date, moment: datetime, round_up: bool = False) -> int:
+    """Índice do bloco de 5 minutos de ``moment`` dentro de ``day``."""
+    offset = moment - datetime.combine(day, datetime.min.time())
+    index = offset // _STEP
+    if round_up and offset % _STEP:
+        index += 1
+    return max(0, min(BITS_PER_DAY, index))
+
+
+def days_between(start: datetime, end: datetime) -> List[date]:
+    days = []
+    day = start.date()
+    while datetime.combine(day, datetime.min.time()) < end:
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def range_mask(day: date, start: datetime, end: datetime) -> int:
+    """Bits ocupados por [start, end) no dia, arredondando para fora."""
+    first = _bit(day, start)
+    last = _bit(day, end, round_up=True)
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def mask_from_intervals(day: date, intervals: Iterable[Interval]) -> int:
+    mask = 0
+    for start, end in intervals:
+        mask |= range_mask(day, start, end)
+    return mask
+
+
+def free_slots(
+    mask: int,
+    day: date,
+    window_start: datetime,
+    window_end: datetime,
+    slot_minutes: int,
+    length: Optional[timedelta] = None,
+) -> List[Dict[str, datetime]]:
+    """Slots livres da janela testando cada candidato com um AND."""
+    step = timedelta(minutes=slot_minutes)
+    length = length or step
+    available = []
+    current = window_start
+    while current + length <= window_end:
+        if not mask & range_mask(day, current, current + length):
+            available.append({'start': current, 'end': current + length})
+        current += step
+    return available
+
+
+def diff_ranges(
+    day: date, expected: int, actual: int
+) -> List[Tuple[datetime, datetime]]:
+    """Trechos do dia em que dois bitmaps divergem."""
+    ranges = []
+    changed = expected ^ actual
+    start = None
+    midnight = datetime.combine(day, datetime.min.time())
+    for bit in range(BITS_PER_DAY + 1):
+        is_set = bit < BITS_PER_DAY and changed >> bit & 1
+        if is_set and start is None:
+            start = bit
+        elif not is_set and start is not None:
+            ranges.append((
+                midnight + start * _STEP,
+                midnight + bit * _STEP,
+            ))
+            start = None
+    return ranges
+
+
+class OccupancyStore:
+    """Ocupação por funcionário e dia em bitmaps de 5 minutos.
+
+    Cada dia é um inteiro de 288 bits (bit ``i`` = minutos
+    ``[5i, 5i + 5)``) com agendamentos e bloqueios. Os dias são
+    carregados sob demanda e atualizados pelas escritas deste processo:
+    reservas novas fazem OR no bitmap; cancelamentos e remarcações
+    descartam o dia, que é reconstruído na próxima leitura, porque um
+    bit pode pertencer a mais de um intervalo. O TTL limita o quanto um
+    worker enxerga atrasadas as escritas feitas pelos outros.
+
+    Quem carrega um dia do banco pega ``version`` antes da consulta e a
+    repassa ao ``put``: se uma escrita tocou o dia nesse meio tempo
+    (ainda fora do cache, então ``occupy`` não teve o que marcar), o
+    bitmap lido é anterior a ela e não é guardado.
+    """
+
+    def __init__(self, ttl_seconds: float = OCCUPANCY_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._days: Dict[Tuple[UUID, date], Tuple[int, float]] = {}
+        # Última escrita por dia (contador global, nunca se repete)
+        self._writes: Dict[Tuple[UUID, date], Tuple[int, float]] = {}
+        self._clock = 0
+        self._generation = 0
+
+    def get(self, employee_id: UUID, day: date) -> Optional[int]:
+        entry = self._days.get((employee_id, day))
+        if entry is None:
+            return None
+        mask, loaded_at = entry
+        if time.monotonic() - loaded_at >= self.ttl_seconds:
+            del self._days[(employee_id, day)]
+            return None
+        return mask
+
+    def version(self, employee_id: UUID, day: date) -> Tuple[int, int]:
+        """Marca a ser repassada ao ``put`` de um dia lido do banco."""
+        write = self._writes.get((employee_id, day))
+        return self._generation, write[0] if write else 0
+
+    def put(
+        self,
+        employee_id: UUID,
+        day: date,
+        mask: int,
+        version: Optional[Tuple[int, int]] = None,
+    ) -> bool:
+        """Guarda o bitmap; com ``version``, só se o dia não mudou."""
+        if version is not None and version != self.version(
+            employee_id, day
+        ):
+            return False
+        now = time.monotonic()
+        if len(self._days) >= OCCUPANCY_MAX_DAYS:
+            self._days = {
+                key: entry
+                for key, entry in self._days.items()
+                if now - entry[1] < self.ttl_seconds
+            }
+            # Nenhuma leitura leva um TTL inteiro entre version e put
+            self._writes = {
+                key: entry
+                for key, entry in self._writes.items()
+                if now - entry[1] < self.ttl_seconds
+            }
+        self._days[(employee_id, day)] = (mask, now)
+        return True
+
+    def _written(self, employee_id: UUID, day: date) -> None:
+        self._clock += 1
+        self._writes[(employee_id, day)] = (self._clock, time.monotonic())
+
+    def keys(self) -> List[Tuple[UUID, date]]:
+        return list(self._days)
+
+    def occupy(
+        self, employee_id: UUID, start: datetime, end: datetime
+    ) -> None:
+        """Marca [start, end) nos dias já carregados."""
+        for day in days_between(start, end):
+            self._written(employee_id, day)
+            entry = self._days.get((employee_id, day))
+            if entry is not None:
+                mask, loaded_at = entry
+                self._days[(employee_id, day)] = (
+                    mask | range_mask(day, start, end),
+                    loaded_at,
+                )
+
+    def release(
+        self, employee_id: UUID, start: datetime, end: datetime
+    ) -> None:
+        """Descarta os dias tocados por [start, end)."""
+        for day in days_between(start, end):
+            self._written(employee_id, day)
+            self._days.pop((employee_id, day), None)
+
+    def invalidate(self, employee_id: Optional[UUID] = None) -> None:
+        # Vale também para os dias que ainda estão sendo carregados
+        self._generation += 1
+        if employee_id is None:
+            self._days.clear()
+            return
+        for key in [k for k in self._days if k[0] == employee_id]:
+            del self._days[key]
+
+
+occupancy_store = OccupancyStore()
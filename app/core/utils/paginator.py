@@ -0,0 +1,215 @@
+# app/core/utils/paginator.py
+import asyncio
+import json
+from functools import partial
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.inspection import inspect
+
+from app.core.utils.count_cache import count_cache
+from app.core.utils.cursor import fetch_cursor_page
+from app.core.utils.pool_metrics import pool_metrics
+from app.db.db import AsyncSessionLocal
+from app.db.replica import replica_monitor
+from app.schemas.pagination import BuildMetadata, PaginationParams
+from app.settings.settings import settings
+
+TOTAL_KEY = '_total_count'
+
+
+def mapped_sort_column(order_by: Optional[str], *models):
+    """
+    Coluna mapeada ``order_by`` do primeiro modelo que a tenha.
+
+    Só colunas contam: ``metadata``, relações e métodos devolvem
+    ``None``, e quem chama cai na ordenação padrão.
+    """
+    for model in models:
+        if order_by in inspect(model).mapper.column_attrs:
+            return getattr(model, order_by)
+    return None
+
+
+class Paginator:
+    """
+    Executa a consulta de listagem e monta o metadata da página.
+
+    No modo offset a página e o total vêm na mesma ida ao banco, com
+    ``count(*) OVER ()`` calculado antes do LIMIT. Com
+    ``count_mode='estimated'`` o total é a estimativa do planner
+    (``EXPLAIN``), sem percorrer a tabela. No modo cursor o total exato
+    ainda exige um ``count`` à parte. Quando o total é uma consulta
+    separada, ela roda junto com a da página numa segunda conexão,
+    se o pool tiver folga.
+
+    Com ``entity`` o total exato passa pelo ``count_cache``: num hit a
+    página é buscada sem a janela e sem ``count``.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        params: PaginationParams,
+        entity: Optional[str] = None,
+        filters: Hashable = None,
+    ):
+        self.session = session
+        self.params = params
+        self.entity = entity
+        # Tudo o que muda o total além do filter_by
+        self.filters = (params.filter_by, params.search_mode, filters)
+
+    async def paginate(
+        self, stmt: Select, sort_column, id_column
+    ) -> Tuple[List[Dict[str, Any]], BuildMetadata]:
+        """
+        Args:
+            stmt (Select): Consulta já filtrada e ordenada.
+            sort_column: Coluna de ordenação (usada no modo cursor).
+            id_column: Coluna única de desempate (usada no modo cursor).
+
+        Returns:
+            Tuple[List[Dict[str, Any]], BuildMetadata]: \
+            linhas da página e metadata.
+        """
+        params = self.params
+        estimated = params.count_mode == 'estimated'
+        next_cursor = previous_cursor = None
+        total_count = cached = None
+        if self.entity and not estimated:
+            cached = count_cache.get(self.entity, self.filters)
+
+        async def cursor_page(session):
+            return await fetch_cursor_page(
+                session, stmt, sort_column, id_column, params
+            )
+
+        if params.pagination_mode == 'cursor':
+            if estimated or cached is None:
+                total = self.estimate_count if estimated else self.count
+                page, total_count = await self._together(
+                    cursor_page, partial(total, stmt)
+                )
+            else:
+                page = await cursor_page(self.session)
+            rows, next_cursor, previous_cursor = page
+        elif estimated:
+            rows, total_count = await self._together(
+                partial(self._fetch_page, stmt),
+                partial(self.estimate_count, stmt),
+            )
+        elif cached is not None:
+            rows = await self._fetch_page(stmt)
+        else:
+            rows = await self._fetch_page(
+                stmt.add_columns(func.count().over().label(TOTAL_KEY))
+            )
+            if rows:
+                total_count = rows[0][TOTAL_KEY]
+            for row in rows:
+                row.pop(TOTAL_KEY)
+
+        if cached is not None:
+            total_count = cached
+        elif total_count is None:
+            # Páginas além do fim não trazem o total na janela; a
+            # primeira página vazia já diz que não há nada
+            if params.pagination_mode == 'offset' and (
+                params.current_page == 1
+            ):
+                total_count = 0
+            else:
+                total_count = await self.count(stmt)
+
+        if self.entity and not estimated and cached is None:
+            count_cache.put(self.entity, self.filters, total_count)
+
+        # Leitura encerrada: com LazySession a conexão volta ao pool
+        # antes da serialização da resposta
+        release = getattr(self.session, 'release', None)
+        if release is not None:
+            await release()
+
+        metadata = BuildMetadata(
+            **BuildMetadata.build_metadata(
+                total_count,
+                params,
+                next_cursor=next_cursor,
+                previous_cursor=previous_cursor,
+                estimated_count=estimated,
+            )
+        )
+        return rows, metadata
+
+    async def _together(self, first, second) -> Tuple[Any, Any]:
+        """
+        ``first`` na sessão da requisição e ``second`` numa segunda
+        sessão, ao mesmo tempo (cada uma com sua conexão do pool). Com
+        pouca folga no pool que as atende (o da réplica, se a sessão lê
+        dela), roda as duas em sequência na mesma sessão.
+
+        Se uma falhar, a ``TaskGroup`` cancela a outra e espera o fim
+        dela antes do rollback e do fechamento das sessões; o erro
+        original segue para o repositório.
+        """
+        # A segunda sessão lê do mesmo lugar (réplica ou primário): a
+        # folga que conta é a do pool que vai atender as duas
+        info = {'read_replica': self.session.info.get('read_replica')}
+        pool = None
+        if info['read_replica'] and replica_monitor.usable():
+            pool = replica_monitor.engine.pool
+        if (
+            pool_metrics.headroom(pool)
+            < settings.db_concurrent_min_headroom
+        ):
+            pool_metrics.sequential += 1
+            return await first(self.session), await second(self.session)
+        pool_metrics.concurrent += 1
+        async with AsyncSessionLocal(info=info) as other:
+            try:
+                async with asyncio.TaskGroup() as group:
+                    page = group.create_task(first(self.session))
+                    total = group.create_task(second(other))
+            except ExceptionGroup as e:
+                raise e.exceptions[0]
+            return page.result(), total.result()
+
+    async def _fetch_page(
+        self, stmt: Select, session: Optional[AsyncSession] = None
+    ) -> List[Dict[str, Any]]:
+        params = self.params
+        result = await (session or self.session).execute(
+            stmt.offset(
+                (params.current_page - 1) * params.rows_per_page
+            ).limit(params.rows_per_page)
+        )
+        return [dict(row._mapping) for row in result.all()]
+
+    async def count(
+        self, stmt: Select, session: Optional[AsyncSession] = None
+    ) -> int:
+        return await (session or self.session).scalar(
+            select(func.count()).select_from(
+                stmt.order_by(None).subquery()
+            )
+        )
+
+    async def estimate_count(
+        self, stmt: Select, session: Optional[AsyncSession] = None
+    ) -> int:
+        """Linhas estimadas pelo planner, sem executar a consulta."""
+        connection = await (session or self.session).connection()
+        compiled = stmt.order_by(None).compile(
+            dialect=connection.dialect,
+            compile_kwargs={'literal_binds': True},
+        )
+        # SQL cru: os filtros já estão renderizados como literais
+        result = await connection.exec_driver_sql(
+            f'EXPLAIN (FORMAT JSON) {compiled}'
+        )
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
@@ -0,0 +1,153 @@
+# app/core/utils/pool_metrics.py
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from app.core.log import setup_logger
+
+log = setup_logger()
+
+# Limites (ms) do histograma de espera por conexão
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+WAIT_WARNING_MS = 100.0
+
+
+class PoolMetrics:
+    """Espera por conexão do pool, por worker.
+
+    ``observe`` recebe o tempo de cada checkout; ``stats`` junta o
+    histograma com o estado atual do pool (em uso, ociosas, overflow).
+    """
+
+    def __init__(self, warning_ms: float = WAIT_WARNING_MS):
+        self.warning_ms = warning_ms
+        self.pool: Optional[Pool] = None
+        self.max_overflow = 0
+        self.reset()
+
+    def reset(self) -> None:
+        self.buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.slow = 0
+        self.timeouts = 0
+        # Página e total da listagem em paralelo ou, sem folga, em série
+        self.concurrent = 0
+        self.sequential = 0
+
+    def observe(self, wait_ms: float) -> None:
+        index = len(WAIT_BUCKETS_MS)
+        for position, limit in enumerate(WAIT_BUCKETS_MS):
+            if wait_ms <= limit:
+                index = position
+                break
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_ms += wait_ms
+        self.max_ms = max(self.max_ms, wait_ms)
+        if wait_ms > self.warning_ms:
+            self.slow += 1
+            log.warning(
+                f'Waited {wait_ms:.1f} ms for a database connection '
+                f'({self.gauges()})'
+            )
+
+    def headroom(self, pool: Optional[Pool] = None) -> int:
+        """Conexões que ainda podem ser pegas sem esperar, no pool do
+        engine ou em ``pool`` (a réplica usa o mesmo ``max_overflow``)."""
+        pool = pool or self.pool
+        if pool is None:
+            return 0
+        capacity = pool.size() + self.max_overflow
+        return capacity - pool.checkedout()
+
+    def gauges(self) -> Dict[str, int]:
+        if self.pool is None:
+            return {}
+        return {
+            'size': self.pool.size(),
+            'in_use': self.pool.checkedout(),
+            'idle': self.pool.checkedin(),
+            'overflow': max(self.pool.overflow(), 0),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        # Contagens acumuladas por limite, como num histograma Prometheus
+        cumulative, histogram = 0, {}
+        for limit, hits in zip(WAIT_BUCKETS_MS + ('+Inf',), self.buckets):
+            cumulative += hits
+            histogram[str(limit)] = cumulative
+        average = self.total_ms / self.count if self.count else 0.0
+        return {
+            **self.gauges(),
+            'checkouts': self.count,
+            'wait_ms_avg': round(average, 3),
+            'wait_ms_max': self.max_ms,
+            'wait_ms_buckets': histogram,
+            'slow_checkouts': self.slow,
+            'timeouts': self.timeouts,
+            'paginate_concurrent': self.concurrent,
+            'paginate_sequential': self.sequential,
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+class StatementMetrics:
+    """Ocupação do cache de SQL compilado (engine) e do cache de
+    prepared statements do asyncpg (por conexão, lido no checkin)."""
+
+    def __init__(self):
+        self.engine = None
+        self.prepared_size = 0
+        self._prepared: Dict[int, int] = {}
+
+    def track(self, engine: AsyncEngine, prepared_size: int) -> None:
+        self.engine = engine.sync_engine
+        self.prepared_size = prepared_size
+        event.listen(self.engine, 'checkin', self._on_checkin)
+        event.listen(self.engine, 'close', self._on_close)
+
+    def _on_checkin(self, dbapi_connection, record) -> None:
+        cache = getattr(
+            dbapi_connection, '_prepared_statement_cache', None
+        )
+        if cache is not None:
+            self._prepared[id(record)] = len(cache)
+
+    def _on_close(self, dbapi_connection, record) -> None:
+        self._prepared.pop(id(record), None)
+
+    def stats(self) -> Dict[str, Any]:
+        compiled = getattr(self.engine, '_compiled_cache', None)
+        prepared = list(self._prepared.values())
+        return {
+            'compiled_cache_entries': len(compiled or ()),
+            'compiled_cache_size': getattr(compiled, 'capacity', 0),
+            'prepared_cache_size': self.prepared_size,
+            'prepared_max_per_connection': max(prepared, default=0),
+            'prepared_total': sum(prepared),
+        }
+
+
+statement_metrics = StatementMetrics()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Pool do engine que mede quanto cada checkout esperou."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.timeouts += 1
+            raise
+        pool_metrics.observe((time.perf_counter() - started) * 1000)
+        return connection
@@ -4,6 +4,8 @@ from uuid import uuid4
 
 from werkzeug.utils import secure_filename
 
+from app.core.utils.image_manifest import image_manifest
+
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg'}
 
 
@@ -60,4 +62,6 @@ class UploadImageProduct:
             f'product_images_{self.description}',
             unique_filename,
         ).replace(os.sep, '/')
+
+        image_manifest.register(self.description, relative_path)
         return relative_path
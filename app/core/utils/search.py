@@ -0,0 +1,40 @@
+# app/core/utils/search.py
+from sqlalchemy import Select, func, literal, or_
+
+from app.schemas.pagination import PaginationParams
+
+SIMILARITY_KEY = 'similarity'
+
+
+def normalize(expression):
+    """Texto sem acentos, na mesma expressão dos índices de trigramas."""
+    return func.immutable_unaccent(expression)
+
+
+def apply_search(stmt: Select, column, params: PaginationParams) -> Select:
+    """
+    Aplica o ``filter_by`` de uma listagem sobre ``column``.
+
+    ``contains`` (padrão) é o ILIKE '%termo%' de sempre, agora sobre
+    ``immutable_unaccent`` para usar o índice GIN de trigramas.
+    ``similar`` também aceita grafias próximas (operador ``%`` do
+    pg_trgm), devolve a coluna ``similarity`` e ordena pelo mais
+    parecido; a ordenação pedida vira critério de desempate.
+    """
+    if not params.filter_by:
+        return stmt
+
+    term = params.filter_by
+    target = normalize(column)
+    contains = target.ilike(normalize(literal(f'%{term}%')))
+    if params.search_mode != 'similar':
+        return stmt.where(contains)
+
+    query = normalize(literal(term))
+    score = func.similarity(target, query)
+    return (
+        stmt
+        .where(or_(contains, target.op('%')(query)))
+        .add_columns(score.label(SIMILARITY_KEY))
+        .order_by(score.desc())
+    )
@@ -0,0 +1,112 @@
+# app/core/utils/singleflight.py
+import asyncio
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Optional,
+    Tuple,
+)
+
+SLOT_REUSE_SECONDS = 2.0
+
+
+class _LeaderCancelled(Exception):
+    """A primeira chamada foi cancelada antes de terminar."""
+
+
+class SingleFlight:
+    """Agrupa chamadas idênticas e concorrentes numa única execução.
+
+    Enquanto a primeira chamada de uma chave está em andamento, as
+    demais aguardam o mesmo resultado. Depois de concluída, o resultado
+    ainda é reaproveitado por ``reuse_seconds``. ``invalidate`` descarta
+    os resultados recentes e desassocia as execuções em andamento, para
+    que uma escrita nunca seja seguida por uma leitura anterior a ela.
+
+    Se a primeira chamada for cancelada (cliente desconectou), quem
+    aguardava não herda o cancelamento: uma delas assume a execução com
+    a própria ``fn``, já que cada ``fn`` usa a sessão da sua requisição.
+
+    A chave deve começar pelo ``employee_id``, usado na invalidação.
+    """
+
+    def __init__(self, reuse_seconds: float = SLOT_REUSE_SECONDS):
+        self.reuse_seconds = reuse_seconds
+        self.hits = 0
+        self.misses = 0
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._done: Dict[Hashable, Tuple[Any, float]] = {}
+        self._generation = 0
+
+    async def do(
+        self, key: Tuple[Hashable, ...], fn: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        entry = self._done.get(key)
+        if entry is not None:
+            result, finished_at = entry
+            if time.monotonic() - finished_at < self.reuse_seconds:
+                self.hits += 1
+                return result
+            del self._done[key]
+
+        future = self._inflight.get(key)
+        while future is not None:
+            try:
+                result = await asyncio.shield(future)
+            except _LeaderCancelled:
+                # Outra chamada pode ter assumido antes desta
+                future = self._inflight.get(key)
+                continue
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # Não cancela o futuro: quem aguarda tenta de novo
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Evita o aviso de exceção não lida quando ninguém aguardava
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        future.set_result(result)
+        if generation == self._generation:
+            self._done[key] = (result, time.monotonic())
+        return result
+
+    def invalidate(self, employee_id: Optional[Hashable] = None) -> None:
+        """Descarta resultados (de um funcionário ou de todos)."""
+        self._generation += 1
+        for store in (self._done, self._inflight):
+            if employee_id is None:
+                store.clear()
+                continue
+            for key in [k for k in store if k[0] == employee_id]:
+                del store[key]
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0,
+            'inflight': len(self._inflight),
+        }
+
+
+slot_flight = SingleFlight()
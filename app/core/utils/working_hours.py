@@ -0,0 +1,104 @@
+# app/core/utils/working_hours.py
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from datetime import time as dt_time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from app.core.utils.availability import Interval
+
+# Mesma ordem de date.weekday(): segunda = 0
+WEEKDAYS = (
+    'segunda',
+    'terça',
+    'quarta',
+    'quinta',
+    'sexta',
+    'sábado',
+    'domingo',
+)
+
+WORKING_HOURS_TTL_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class WorkingHours:
+    start_time: dt_time
+    end_time: dt_time
+    lunch_start: Optional[dt_time] = None
+    lunch_end: Optional[dt_time] = None
+
+    def window(self, day: date) -> Interval:
+        return (
+            datetime.combine(day, self.start_time),
+            datetime.combine(day, self.end_time),
+        )
+
+    def breaks(self, day: date) -> List[Interval]:
+        if not self.lunch_start or not self.lunch_end:
+            return []
+        return [
+            (
+                datetime.combine(day, self.lunch_start),
+                datetime.combine(day, self.lunch_end),
+            )
+        ]
+
+
+Loader = Callable[[], Awaitable[Iterable[Any]]]
+
+
+class WorkingHoursCache:
+    """Jornadas semanais (time_recording.schedule_employee) em memória.
+
+    A tabela é pequena, então um miss recarrega a jornada de todos os
+    funcionários numa única consulta; as requisições seguintes não vão
+    ao banco. ``invalidate`` é chamado quando uma jornada muda e o TTL
+    cobre alterações feitas por outros workers ou direto no banco.
+    """
+
+    def __init__(self, ttl_seconds: float = WORKING_HOURS_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._templates: Dict[UUID, Dict[str, WorkingHours]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def is_fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.ttl_seconds
+        )
+
+    async def get(
+        self, employee_id: UUID, day: date, loader: Loader
+    ) -> Optional[WorkingHours]:
+        """Jornada do funcionário no dia da semana de ``day``."""
+        if not self.is_fresh():
+            async with self._lock:
+                if not self.is_fresh():
+                    self._load(await loader())
+        return self._templates.get(employee_id, {}).get(
+            WEEKDAYS[day.weekday()]
+        )
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def _load(self, rows: Iterable[Any]) -> None:
+        templates: Dict[UUID, Dict[str, WorkingHours]] = {}
+        for row in rows:
+            templates.setdefault(row.employee_id, {})[row.weekday] = (
+                WorkingHours(
+                    start_time=row.start_time,
+                    end_time=row.end_time,
+                    lunch_start=row.lunch_start,
+                    lunch_end=row.lunch_end,
+                )
+            )
+        self._templates = templates
+        self._loaded_at = time.monotonic()
+
+
+working_hours_cache = WorkingHoursCache()
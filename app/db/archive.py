@@ -0,0 +1,265 @@
+# app/db/archive.py
+import asyncio
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    MetaData,
+    Table,
+    and_,
+    delete,
+    exists,
+    func,
+    insert,
+    or_,
+    select,
+    true,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.log import setup_logger
+from app.core.utils.count_cache import count_cache
+from app.db.base import Base
+from app.db.partitions import ARCHIVE_SCHEMA
+from app.models.block import ScheduleBlock
+from app.models.employee import Employee
+from app.models.product import Products, ProductsEmployees
+from app.models.schedule import ScheduleService
+from app.models.time_recording import ScheduleEmployee
+from app.models.users import User
+from app.settings.settings import settings
+
+log = setup_logger()
+
+ARCHIVE_BATCH_SIZE = 500
+ARCHIVE_PAUSE_SECONDS = 0.5
+ARCHIVE_INTERVAL_SECONDS = 60 * 60
+
+archive_metadata = MetaData()
+
+
+def archive_table(table: Table) -> Table:
+    """Tabela espelho de ``table`` no schema ``archive``."""
+    key = f'{ARCHIVE_SCHEMA}.{table.name}'
+    if key in archive_metadata.tables:
+        return archive_metadata.tables[key]
+    return Table(
+        table.name,
+        archive_metadata,
+        *(Column(column.name, column.type) for column in table.columns),
+        Column('archived_at', DateTime, server_default=func.now()),
+        schema=ARCHIVE_SCHEMA,
+    )
+
+
+def soft_deleted(table: Table, cutoff: datetime):
+    """Excluídos antes de ``cutoff``: a retenção conta de
+    ``deleted_at``, gravado por todo delete."""
+    return and_(table.c.is_deleted == True, table.c.deleted_at < cutoff)
+
+
+def finished_schedule(table: Table, cutoff: datetime):
+    """Agendamentos excluídos ou atendidos (``is_check``)."""
+    return or_(
+        soft_deleted(table, cutoff),
+        and_(table.c.is_check == True, table.c.time_register < cutoff),
+    )
+
+
+# Referências sem ForeignKey no banco: (coluna que referencia, tabela)
+IMPLICIT_REFERENCES = [
+    (ScheduleService.__table__.c.user_id, User.__table__),
+]
+
+
+def unreferenced(table: Table):
+    """
+    Linhas que nenhuma outra tabela referencia: um funcionário excluído
+    com agendamentos ainda quentes fica onde está até eles saírem.
+    Além das FKs, vale ``IMPLICIT_REFERENCES`` (o cliente do
+    agendamento não tem FK).
+    """
+    guards = [
+        ~exists().where(fk.parent == fk.column)
+        for other in Base.metadata.tables.values()
+        if other is not table
+        for fk in other.foreign_keys
+        if fk.column.table is table
+    ]
+    guards += [
+        ~exists().where(column == table.c.id)
+        for column, target in IMPLICIT_REFERENCES
+        if target is table
+    ]
+    return and_(true(), *guards)
+
+
+@dataclass(frozen=True)
+class ArchivePolicy:
+    # Chave em settings.archive_retention_days
+    name: str
+    table: Table
+    condition: Callable[[Table, datetime], Any]
+    # Entidade do count_cache afetada pela remoção
+    entity: Optional[str] = None
+
+
+# Filhos antes dos pais, para liberar as referências na mesma rodada
+POLICIES: List[ArchivePolicy] = [
+    ArchivePolicy(
+        'schedule',
+        ScheduleService.__table__,
+        finished_schedule,
+        'schedules',
+    ),
+    ArchivePolicy('block', ScheduleBlock.__table__, soft_deleted),
+    ArchivePolicy(
+        'schedule_employee', ScheduleEmployee.__table__, soft_deleted
+    ),
+    ArchivePolicy(
+        'products_employees', ProductsEmployees.__table__, soft_deleted
+    ),
+    ArchivePolicy(
+        'products', Products.__table__, soft_deleted, 'products'
+    ),
+    ArchivePolicy(
+        'employees', Employee.__table__, soft_deleted, 'employees'
+    ),
+    ArchivePolicy('user', User.__table__, soft_deleted, 'users'),
+]
+
+
+class Archiver:
+    """
+    Move linhas antigas para o schema ``archive`` em lotes.
+
+    Cada lote é uma transação curta: ``DELETE ... RETURNING`` e
+    ``INSERT`` no mesmo comando, sobre no máximo ``batch_size`` linhas
+    escolhidas com ``FOR UPDATE SKIP LOCKED``, para não disputar
+    bloqueios com as requisições.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+        pause_seconds: float = ARCHIVE_PAUSE_SECONDS,
+    ):
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    async def archive_batch(
+        self,
+        conn: AsyncConnection,
+        policy: ArchivePolicy,
+        cutoff: datetime,
+    ) -> int:
+        table = policy.table
+        names = [column.name for column in table.columns]
+        candidates = (
+            select(table.c.id)
+            .where(policy.condition(table, cutoff), unreferenced(table))
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        moved = (
+            delete(table)
+            .where(table.c.id.in_(candidates))
+            .returning(*table.columns)
+            .cte('moved')
+        )
+        stmt = (
+            insert(archive_table(table))
+            .from_select(names, select(*(moved.c[n] for n in names)))
+            .add_cte(moved)
+        )
+        result = await conn.execute(stmt)
+        return result.rowcount
+
+    async def archive_policy(
+        self, engine: AsyncEngine, policy: ArchivePolicy, days: int
+    ) -> int:
+        cutoff = datetime.now() - timedelta(days=days)
+        stats = self._stats.setdefault(
+            policy.name,
+            {'archived': 0, 'batches': 0, 'last_run': None, 'error': None},
+        )
+        started = time.monotonic()
+        total = 0
+        try:
+            while True:
+                async with engine.begin() as conn:
+                    moved = await self.archive_batch(conn, policy, cutoff)
+                total += moved
+                stats['archived'] += moved
+                stats['batches'] += 1
+                if moved < self.batch_size:
+                    break
+                await asyncio.sleep(self.pause_seconds)
+            stats['error'] = None
+        except Exception as e:
+            stats['error'] = str(e)
+            log.error(f'Error archiving {policy.name}: {e}')
+        finally:
+            stats['last_run'] = datetime.now().isoformat()
+            stats['last_run_rows'] = total
+            stats['last_run_seconds'] = round(
+                time.monotonic() - started, 3
+            )
+            if total and policy.entity:
+                count_cache.invalidate(policy.entity)
+        return total
+
+    async def run_once(
+        self, engine: AsyncEngine, retention: Dict[str, int]
+    ) -> Dict[str, int]:
+        """Uma rodada por todas as tabelas com retenção configurada."""
+        archived = {}
+        for policy in POLICIES:
+            days = retention.get(policy.name)
+            if days is None:
+                continue
+            archived[policy.name] = await self.archive_policy(
+                engine, policy, days
+            )
+        return archived
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: dict(values) for name, values in self._stats.items()}
+
+
+archiver = Archiver(settings.archive_batch_size)
+
+
+async def run_archiver(
+    engine: AsyncEngine,
+    retention: Dict[str, int],
+    interval_seconds: int = ARCHIVE_INTERVAL_SECONDS,
+) -> None:
+    """Laço do lifespan: uma rodada de arquivamento por intervalo."""
+    while True:
+        archived = await archiver.run_once(engine, retention)
+        if any(archived.values()):
+            log.info(f'Archived rows: {archived}')
+        await asyncio.sleep(interval_seconds)
+
+
+async def _run(retention: Dict[str, int]) -> Dict[str, int]:
+    from app.db.db import engine
+
+    return await archiver.run_once(engine, retention)
+
+
+if __name__ == '__main__':
+    # python -m app.db.archive [tabela=dias ...]
+    retention = dict(settings.archive_retention_days)
+    for arg in sys.argv[1:]:
+        name, _, days = arg.partition('=')
+        retention[name] = int(days)
+    archived = asyncio.run(_run(retention))
+    sys.stdout.write(f'Archived rows: {archived}\n')
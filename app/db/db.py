@@ -1,22 +1,92 @@
 # app/db/db.py
+from typing import Optional
+
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     create_async_engine,
 )
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
+from app.core.utils.pool_metrics import (
+    TimedQueuePool,
+    pool_metrics,
+    statement_metrics,
+)
+from app.db.replica import replica_monitor
 from app.settings.settings import settings
 
 engine: AsyncEngine = create_async_engine(
     settings.sqlalchemy_database_uri,
     future=True,
     echo=False,
+    poolclass=TimedQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    pool_recycle=settings.db_pool_recycle,
+    query_cache_size=settings.db_query_cache_size,
+    connect_args={
+        'prepared_statement_cache_size': (
+            settings.db_prepared_statement_cache_size
+        )
+    },
 )
+pool_metrics.pool = engine.pool
+pool_metrics.max_overflow = settings.db_max_overflow
+pool_metrics.warning_ms = settings.db_pool_wait_warning_ms
+statement_metrics.track(engine, settings.db_prepared_statement_cache_size)
+
+replica_engine: Optional[AsyncEngine] = None
+if settings.sqlalchemy_replica_uri:
+    replica_engine = create_async_engine(
+        settings.sqlalchemy_replica_uri,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle,
+        query_cache_size=settings.db_query_cache_size,
+        connect_args={
+            'prepared_statement_cache_size': (
+                settings.db_prepared_statement_cache_size
+            )
+        },
+    )
+    replica_monitor.attach(
+        replica_engine, settings.replica_max_lag_seconds
+    )
+
+
+class RoutingSession(Session):
+    """
+    Sessões com ``info['read_replica']`` leem da réplica enquanto ela
+    estiver em dia. Escritas, flush, ``SELECT ... FOR UPDATE`` e SQL
+    cru ficam no primário; depois da primeira escrita a sessão inteira
+    passa a ler do primário.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.info.get('read_replica'):
+            is_read = (
+                getattr(clause, 'is_select', False)
+                and getattr(clause, '_for_update_arg', None) is None
+            )
+            if is_read and not self._flushing:
+                if replica_monitor.usable():
+                    replica_monitor.reads += 1
+                    return replica_engine.sync_engine
+                replica_monitor.fallbacks += 1
+            elif self._flushing or getattr(clause, 'is_dml', False):
+                self.info['read_replica'] = False
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
     autoflush=False,
     autocommit=False,
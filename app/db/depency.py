@@ -1,13 +1,37 @@
 # app/db/dependency.py
 
+from functools import partial
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Request
 
 from app.db.db import AsyncSessionLocal
+from app.db.replica import pinned_to_primary
+from app.db.session import LazySession
 
 
 # Dependency
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
+async def get_db() -> AsyncGenerator[LazySession, None]:
+    # A sessão (e a conexão) só existe se o handler chegar ao banco
+    session = LazySession(AsyncSessionLocal)
+    try:
         yield session
+    finally:
+        await session.close()
+
+
+async def get_read_db(
+    request: Request,
+) -> AsyncGenerator[LazySession, None]:
+    # Rotas só de leitura: réplica, salvo logo após escrita do cliente.
+    # POST de consulta (slots) também não prende o cliente ao primário.
+    request.state.read_only = True
+    factory = partial(
+        AsyncSessionLocal,
+        info={'read_replica': not pinned_to_primary(request)},
+    )
+    session = LazySession(factory)
+    try:
+        yield session
+    finally:
+        await session.close()
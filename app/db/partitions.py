@@ -0,0 +1,223 @@
+# app/db/partitions.py
+import asyncio
+import re
+import sys
+from datetime import date, datetime
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.log import setup_logger
+
+log = setup_logger()
+
+ARCHIVE_SCHEMA = 'archive'
+DEFAULT_PARTITION = 'schedule_default'
+PARTITIONS_AHEAD = 3
+PARTITION_CHECK_SECONDS = 24 * 60 * 60
+
+# Sem sobreposição por funcionário; por partição porque na tabela
+# particionada a constraint teria de incluir time_register com igualdade
+OVERLAP_CONSTRAINT = (
+    'ALTER TABLE service.{name} ADD CONSTRAINT {name}_no_overlap '
+    'EXCLUDE USING gist (employee_id WITH =, '
+    'tsrange(time_register, end_time) WITH &&) '
+    'WHERE (is_deleted = false)'
+)
+
+_PARTITION_NAME = re.compile(r'^schedule_y(\d{4})m(\d{2})$')
+
+
+def add_months(day: date, months: int) -> date:
+    """Primeiro dia do mês ``months`` meses depois de ``day``."""
+    year, month = divmod(day.month - 1 + months, 12)
+    return date(day.year + year, month + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f'schedule_y{month.year}m{month.month:02d}'
+
+
+def partition_month(name: str) -> Optional[date]:
+    match = _PARTITION_NAME.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+async def list_partitions(conn: AsyncConnection) -> List[str]:
+    """Partições mensais anexadas a service.schedule."""
+    result = await conn.execute(
+        text(
+            'SELECT child.relname FROM pg_inherits i '
+            'JOIN pg_class child ON child.oid = i.inhrelid '
+            'JOIN pg_class parent ON parent.oid = i.inhparent '
+            'JOIN pg_namespace n ON n.oid = parent.relnamespace '
+            "WHERE n.nspname = 'service' AND parent.relname = 'schedule' "
+            'ORDER BY child.relname'
+        )
+    )
+    return [name for name in result.scalars() if partition_month(name)]
+
+
+async def is_partitioned(conn: AsyncConnection) -> bool:
+    relkind = await conn.scalar(
+        text(
+            'SELECT relkind FROM pg_class '
+            "WHERE oid = 'service.schedule'::regclass"
+        )
+    )
+    return relkind == 'p'
+
+
+async def create_partition(conn: AsyncConnection, month: date) -> None:
+    """
+    Cria a partição do mês.
+
+    Agendamentos marcados além do horizonte caem na partição DEFAULT;
+    se houver algum no mês, eles são movidos para a tabela nova antes
+    do ATTACH, que falharia com a DEFAULT sobrepondo o intervalo (a
+    tabela nova copia os CHECKs da mãe, exigidos pelo ATTACH).
+    """
+    name = partition_name(month)
+    bounds = {
+        'start': datetime.combine(month, datetime.min.time()),
+        'end': datetime.combine(add_months(month, 1), datetime.min.time()),
+    }
+    in_default = await conn.scalar(
+        text(
+            f'SELECT EXISTS (SELECT 1 FROM service.{DEFAULT_PARTITION} '
+            'WHERE time_register >= :start AND time_register < :end)'
+        ),
+        bounds,
+    )
+    values = (
+        f"FOR VALUES FROM ('{month.isoformat()}') "
+        f"TO ('{add_months(month, 1).isoformat()}')"
+    )
+    if not in_default:
+        await conn.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS service.{name} '
+                f'PARTITION OF service.schedule {values}'
+            )
+        )
+        await conn.execute(text(OVERLAP_CONSTRAINT.format(name=name)))
+        return
+
+    await conn.execute(
+        text(
+            f'CREATE TABLE service.{name} '
+            '(LIKE service.schedule INCLUDING DEFAULTS '
+            'INCLUDING CONSTRAINTS)'
+        )
+    )
+    await conn.execute(text(OVERLAP_CONSTRAINT.format(name=name)))
+    await conn.execute(
+        text(
+            'WITH moved AS ('
+            f'DELETE FROM service.{DEFAULT_PARTITION} '
+            'WHERE time_register >= :start AND time_register < :end '
+            f'RETURNING *) INSERT INTO service.{name} SELECT * FROM moved'
+        ),
+        bounds,
+    )
+    await conn.execute(
+        text(
+            f'ALTER TABLE service.schedule ATTACH PARTITION '
+            f'service.{name} {values}'
+        )
+    )
+
+
+async def ensure_partitions(
+    conn: AsyncConnection,
+    months_ahead: int = PARTITIONS_AHEAD,
+    today: Optional[date] = None,
+) -> List[str]:
+    """Garante as partições do mês atual e dos ``months_ahead`` meses
+    seguintes. Não faz nada se a tabela ainda não for particionada."""
+    if not await is_partitioned(conn):
+        return []
+    first = (today or date.today()).replace(day=1)
+    existing = set(await list_partitions(conn))
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(first, offset)
+        if partition_name(month) not in existing:
+            await create_partition(conn, month)
+            created.append(partition_name(month))
+    return created
+
+
+async def detach_partitions(
+    conn: AsyncConnection, keep_months: int, today: Optional[date] = None
+) -> List[str]:
+    """
+    Desanexa as partições anteriores aos últimos ``keep_months`` meses e
+    as move para o schema ``archive``. Lá elas só são lidas por SQL
+    direto: ``GET /schedule?archived=true`` lê ``archive.schedule``.
+
+    Com a partição DEFAULT o PostgreSQL recusa ``DETACH ...
+    CONCURRENTLY``; o DETACH simples segura ACCESS EXCLUSIVE em
+    ``service.schedule`` até o commit, mas só altera o catálogo.
+    """
+    cutoff = add_months(
+        (today or date.today()).replace(day=1), -keep_months
+    )
+    await conn.execute(
+        text(f'CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}')
+    )
+    detached = []
+    for name in await list_partitions(conn):
+        if partition_month(name) >= cutoff:
+            continue
+        await conn.execute(
+            text(
+                'ALTER TABLE service.schedule '
+                f'DETACH PARTITION service.{name}'
+            )
+        )
+        await conn.execute(
+            text(f'ALTER TABLE service.{name} SET SCHEMA {ARCHIVE_SCHEMA}')
+        )
+        detached.append(name)
+    return detached
+
+
+async def maintain_partitions(
+    engine: AsyncEngine, months_ahead: int = PARTITIONS_AHEAD
+) -> None:
+    """Laço do lifespan: confere as partições futuras uma vez por dia."""
+    while True:
+        try:
+            async with engine.begin() as conn:
+                created = await ensure_partitions(conn, months_ahead)
+            if created:
+                log.info(f'Schedule partitions created: {created}')
+        except Exception as e:
+            # Outro worker pode ter criado a mesma partição
+            log.error(f'Error ensuring schedule partitions: {e}')
+        await asyncio.sleep(PARTITION_CHECK_SECONDS)
+
+
+async def _run(command: str, months: int) -> List[str]:
+    from app.db.db import engine
+
+    async with engine.begin() as conn:
+        if command == 'detach':
+            return await detach_partitions(conn, months)
+        return await ensure_partitions(conn, months)
+
+
+if __name__ == '__main__':
+    # python -m app.db.partitions ensure [meses à frente]
+    # python -m app.db.partitions detach <meses mantidos>
+    command = sys.argv[1] if len(sys.argv) > 1 else 'ensure'
+    if command == 'detach' and len(sys.argv) < 3:
+        sys.exit('usage: python -m app.db.partitions detach <months>')
+    months = int(sys.argv[2]) if len(sys.argv) > 2 else PARTITIONS_AHEAD
+    names = asyncio.run(_run(command, months))
+    action = 'Detached' if command == 'detach' else 'Created'
+    sys.stdout.write(f'{action} {len(names)} partitions: {names}\n')
@@ -0,0 +1,135 @@
+# app/db/replica.py
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.log import setup_logger
+
+log = setup_logger()
+
+# Cookie com o instante (epoch) até o qual as leituras ficam no primário
+PIN_COOKIE = 'read_primary_until'
+SAFE_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+REPLICA_CHECK_SECONDS = 5.0
+REPLICA_MAX_LAG_SECONDS = 5.0
+
+# Atraso da réplica em segundos. Sem WAL pendente o atraso é zero, mesmo
+# com o primário parado; fora de recovery (duas instâncias locais
+# independentes, em teste) também.
+LAG_QUERY = text(
+    'SELECT CASE '
+    'WHEN NOT pg_is_in_recovery() THEN 0 '
+    'WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+    'ELSE coalesce(extract(epoch FROM '
+    'now() - pg_last_xact_replay_timestamp()), 1e9) END'
+)
+
+
+class ReplicaMonitor:
+    """
+    Estado da réplica de leitura.
+
+    ``check`` mede o atraso periodicamente; erros de conexão na própria
+    réplica a tiram de uso na hora. Enquanto ``usable`` for falso as
+    leituras voltam para o primário.
+    """
+
+    def __init__(self, max_lag_seconds: float = REPLICA_MAX_LAG_SECONDS):
+        self.engine: Optional[AsyncEngine] = None
+        self.max_lag_seconds = max_lag_seconds
+        self.available = False
+        self.lag_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.reads = 0
+        self.fallbacks = 0
+
+    def attach(self, engine: AsyncEngine, max_lag_seconds: float) -> None:
+        self.engine = engine
+        self.max_lag_seconds = max_lag_seconds
+        event.listen(engine.sync_engine, 'handle_error', self._on_error)
+
+    def usable(self) -> bool:
+        return self.engine is not None and self.available
+
+    def _on_error(self, context) -> None:
+        # Conexão recusada ou derrubada; erros de SQL não contam
+        if context.is_disconnect or context.connection is None:
+            self.mark_down(str(context.original_exception))
+
+    def mark_down(self, error: str) -> None:
+        if self.available:
+            log.warning(f'Read replica unavailable: {error}')
+        self.available = False
+        self.last_error = error
+
+    async def check(self) -> None:
+        try:
+            async with self.engine.connect() as conn:
+                lag = float(await conn.scalar(LAG_QUERY))
+        except Exception as e:
+            self.mark_down(str(e))
+            return
+        self.lag_seconds = lag
+        self.last_error = None
+        caught_up = lag <= self.max_lag_seconds
+        if caught_up != self.available:
+            log.warning(
+                f'Read replica {"back in" if caught_up else "out of"} '
+                f'use (lag {lag:.1f}s)'
+            )
+        self.available = caught_up
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'configured': self.engine is not None,
+            'available': self.available,
+            'lag_seconds': self.lag_seconds,
+            'max_lag_seconds': self.max_lag_seconds,
+            'reads': self.reads,
+            'fallbacks': self.fallbacks,
+            'last_error': self.last_error,
+        }
+
+
+replica_monitor = ReplicaMonitor()
+
+
+async def monitor_replica(
+    interval_seconds: float = REPLICA_CHECK_SECONDS,
+) -> None:
+    """Laço do lifespan: confere o atraso da réplica."""
+    while True:
+        await replica_monitor.check()
+        await asyncio.sleep(interval_seconds)
+
+
+def pinned_to_primary(request: Request) -> bool:
+    """O cliente escreveu há pouco: deve ler o que acabou de gravar."""
+    try:
+        return float(request.cookies.get(PIN_COOKIE)) > time.time()
+    except (TypeError, ValueError):
+        return False
+
+
+def pin_after_write(
+    request: Request, response: Response, seconds: int
+) -> None:
+    """Marca o cliente após uma escrita bem-sucedida. Cookie, e não
+    memória, porque a próxima leitura pode cair em outro worker. Rotas
+    que usam ``get_read_db`` marcam ``request.state.read_only`` e ficam
+    de fora, mesmo com POST."""
+    if request.method in SAFE_METHODS or response.status_code >= 400:
+        return
+    if getattr(request.state, 'read_only', False):
+        return
+    response.set_cookie(
+        PIN_COOKIE,
+        f'{time.time() + seconds:.0f}',
+        max_age=seconds,
+        httponly=True,
+        samesite='lax',
+    )
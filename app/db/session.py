@@ -0,0 +1,47 @@
+# app/db/session.py
+from typing import Any, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class LazySession:
+    """
+    ``AsyncSession`` criada só no primeiro uso.
+
+    Requisições que falham na validação ou respondem do cache não criam
+    sessão nem tocam o pool. A conexão é pega no primeiro ``execute`` e
+    volta ao pool no ``commit``/``rollback`` do repositório; leituras
+    chamam ``release`` para soltá-la antes da serialização da resposta,
+    em vez de no fim da dependência.
+    """
+
+    def __init__(self, factory: Callable[[], AsyncSession]):
+        self._factory = factory
+        self._session: Optional[AsyncSession] = None
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._factory()
+        return self._session
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+    async def release(self) -> None:
+        """
+        Encerra a transação de leitura e devolve a conexão ao pool.
+
+        Só para caminhos de leitura: um UPDATE ainda sem commit seria
+        confirmado aqui.
+        """
+        session = self._session
+        if session is None or not session.in_transaction():
+            return
+        if session.new or session.dirty or session.deleted:
+            return
+        await session.commit()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
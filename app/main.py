@@ -1,13 +1,50 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from app.api import init_routers
+from app.core.utils.image_manifest import image_manifest
+from app.db.archive import run_archiver
+from app.db.db import engine, replica_engine
+from app.db.partitions import maintain_partitions
+from app.db.replica import monitor_replica, pin_after_write
+from app.settings.settings import settings
 
-app = FastAPI(title='FastAPI - Build Barbershop', version='1.0.1')
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Índice de imagens montado uma vez, fora do caminho das requisições
+    image_manifest.load()
+    partitions = asyncio.create_task(
+        maintain_partitions(engine, settings.schedule_partitions_ahead)
+    )
+    archiving = asyncio.create_task(
+        run_archiver(
+            engine,
+            settings.archive_retention_days,
+            settings.archive_interval_seconds,
+        )
+    )
+    tasks = [partitions, archiving]
+    if replica_engine is not None:
+        tasks.append(
+            asyncio.create_task(
+                monitor_replica(settings.replica_check_seconds)
+            )
+        )
+    yield
+    for task in tasks:
+        task.cancel()
+
+
+app = FastAPI(
+    title='FastAPI - Build Barbershop', version='1.0.1', lifespan=lifespan
+)
 
 
 origins = os.getenv('CORS_ORIGINS', '').split(',')
@@ -19,6 +56,15 @@ app.add_middleware(
     allow_headers=['*'],
 )
 
+
+@app.middleware('http')
+async def pin_primary_after_write(request: Request, call_next):
+    response = await call_next(request)
+    if replica_engine is not None:
+        pin_after_write(request, response, settings.replica_pin_seconds)
+    return response
+
+
 # init routes from routers
 init_routers(app)
 
@@ -26,6 +26,7 @@ class Products(BaseModels):
     )
     commission: Mapped[float] = mapped_column(Float, nullable=False)
     category: Mapped[str] = mapped_column(String(20), nullable=False)
+    image_path: Mapped[str] = mapped_column(String(255), nullable=True)
 
 
 class ProductsEmployees(BaseModels):
@@ -1,7 +1,14 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    FetchedValue,
+    ForeignKey,
+    Integer,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -24,6 +31,11 @@ class ScheduleService(Base):
     time_register: Mapped[datetime] = mapped_column(
         DateTime, nullable=False
     )
+    # time_register + duração do produto, preenchido pelo trigger
+    # schedule_set_end_time; base da constraint contra sobreposição
+    end_time: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=FetchedValue()
+    )
 
     employee_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey('employee.employees.id'), nullable=False
@@ -52,6 +64,12 @@ class ScheduleService(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
     deleted_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
     is_deleted: Mapped[bool] = mapped_column(Boolean, default=False)
+    is_check: Mapped[bool] = mapped_column(
+        Boolean, server_default=text('false'), nullable=False
+    )
+    is_awayalone: Mapped[bool] = mapped_column(
+        Boolean, server_default=text('false'), nullable=False
+    )
 
     def __repr__(self):
         return f"""{self.id} created successfully"""
@@ -44,6 +44,6 @@ class ScheduleEmployee(BaseModels):
     weekday: Mapped[str] = mapped_column(String(9), nullable=False)
 
     start_time: Mapped[datetime.time] = mapped_column(Time, nullable=False)
-    lunch_start: Mapped[datetime.time] = mapped_column(Time)
-    lunch_end: Mapped[datetime.time] = mapped_column(Time)
+    lunch_start: Mapped[datetime.time] = mapped_column(Time, nullable=True)
+    lunch_end: Mapped[datetime.time] = mapped_column(Time, nullable=True)
     end_time: Mapped[datetime.time] = mapped_column(Time)
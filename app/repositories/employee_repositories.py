@@ -2,12 +2,15 @@ from datetime import datetime
 from typing import Any, Dict, List, Tuple
 
 from passlib.context import CryptContext
-from sqlalchemy import func, insert, select, update
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.exception.exceptions import DatabaseError
+from app.core.exception.exceptions import AppException, DatabaseError
 from app.core.log import setup_logger
+from app.core.utils.count_cache import count_cache
 from app.core.utils.metadata import Metadata
+from app.core.utils.paginator import Paginator, mapped_sort_column
+from app.core.utils.search import apply_search
 from app.models.employee import Employee
 from app.schemas.employee import (
     EmployeeBase,
@@ -46,6 +49,7 @@ class EmployeeRepositories:
             )
             await self.session.execute(stmt)
             await self.session.commit()
+            count_cache.invalidate('employees')
 
             return EmployeeOut(message_id='employee_created_successfully')
         except Exception as e:
@@ -65,66 +69,38 @@ class EmployeeRepositories:
                 self.employee.role,
             ).where(self.employee.is_deleted.__eq__(False))
 
-            # Filtro por nome
-            if pagination_params.filter_by:
-                filter_value = f'%{pagination_params.filter_by}%'
-                try:
-                    stmt = stmt.filter(
-                        func.unaccent(self.employee.username).ilike(
-                            func.unaccent(filter_value)
-                        )
-                    )
-                except Exception:
-                    stmt = stmt.filter(
-                        self.employee.username.ilike(filter_value)
-                    )
+            # Filtro por nome (trigramas, com ranking opcional)
+            stmt = apply_search(
+                stmt, self.employee.username, pagination_params
+            )
 
             # Ordenação
-            if pagination_params.order_by:
-                try:
-                    sort_column = getattr(
-                        self.employee, pagination_params.order_by
-                    )
-                    sort_direction = (
-                        pagination_params.sort_by or 'asc'
-                    ).lower()
-                    stmt = stmt.order_by(
-                        sort_column.asc()
-                        if sort_direction == 'asc'
-                        else sort_column.desc()
-                    )
-                except AttributeError:
-                    log.warning(
-                        f'Logger: Campo de ordenação inválido: \
-                        {pagination_params.order_by}'
-                    )
-
-            # Total de registros
-            total_count = await self.session.execute(
-                select(func.count()).select_from(stmt.subquery())
+            sort_column = mapped_sort_column(
+                pagination_params.order_by, self.employee
             )
-            total_count = total_count.scalar()
-
-            # Paginação
-            paginated_stmt = stmt.offset(
-                (pagination_params.current_page - 1)
-                * pagination_params.rows_per_page
-            ).limit(pagination_params.rows_per_page)
-
-            result = await self.session.execute(paginated_stmt)
-            result = result.all()
-
-            metadata = BuildMetadata(
-                total_count=total_count,
-                current_page=pagination_params.current_page,
-                rows_per_page=pagination_params.rows_per_page,
-                total_pages=(
-                    total_count + pagination_params.rows_per_page - 1
+            if sort_column is None:
+                log.warning(
+                    f'Logger: Campo de ordenação inválido: \
+                    {pagination_params.order_by}'
                 )
-                // pagination_params.rows_per_page,
+                sort_column = self.employee.id
+            if (pagination_params.sort_by or 'asc').lower() == 'asc':
+                stmt = stmt.order_by(sort_column.asc())
+            else:
+                stmt = stmt.order_by(sort_column.desc())
+
+            # Página e total numa única ida ao banco
+            result, metadata = await Paginator(
+                self.session, pagination_params, entity='employees'
+            ).paginate(
+                stmt,
+                sort_column,
+                self.employee.id,
             )
             return Metadata(result).model_to_list(), metadata
 
+        except AppException:
+            raise
         except Exception as e:
             log.error(f'Error listing employees: {e}')
             raise DatabaseError(
@@ -179,6 +155,7 @@ class EmployeeRepositories:
                 )
                 await self.session.execute(stmt)
                 await self.session.commit()
+                count_cache.invalidate('employees')
 
             return EmployeeUpdateOut(
                 message_id='employee_updated_successfully'
@@ -194,10 +171,11 @@ class EmployeeRepositories:
             stmt = (
                 update(self.employee)
                 .where(self.employee.id == employee_id)
-                .values(is_deleted=True)
+                .values(is_deleted=True, deleted_at=datetime.now())
             )
             await self.session.execute(stmt)
             await self.session.commit()
+            count_cache.invalidate('employees')
             return EmployeeOut(message_id='employee_deleted_successfully')
         except Exception as e:
             self.session.rollback()
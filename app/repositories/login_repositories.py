@@ -1,6 +1,6 @@
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.auth import create_access_token
@@ -17,6 +17,15 @@ from app.schemas.login import (
 
 log = setup_logger()
 
+# Montadas uma vez: o SQLAlchemy reaproveita a chave de cache e o SQL
+# compilado, e o asyncpg o prepared statement de cada conexão
+USER_BY_PHONE = select(User).where(
+    User.phone == bindparam('phone'), User.is_deleted == False
+)
+EMPLOYEE_BY_PHONE = select(Employee).where(
+    Employee.phone == bindparam('phone'), Employee.is_deleted == False
+)
+
 
 class LoginRepositories:
     def __init__(self, session: AsyncSession):
@@ -27,7 +36,7 @@ class LoginRepositories:
     async def get_login(self, data: LoginUser) -> Optional[LoginUserOut]:
         try:
             user = await self.session.execute(
-                select(self.user).where(self.user.phone == data.phone)
+                USER_BY_PHONE, {'phone': data.phone}
             )
             user = user.scalar_one_or_none()
             if user:
@@ -54,9 +63,7 @@ class LoginRepositories:
     ) -> Optional[LoginEmployeeOut]:
         try:
             employee = await self.session.execute(
-                select(self.employee).where(
-                    self.employee.phone == data.phone
-                )
+                EMPLOYEE_BY_PHONE, {'phone': data.phone}
             )
             employee = employee.scalar_one_or_none()
             if employee:
@@ -1,13 +1,28 @@
 import os
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Any, Dict, List, Tuple
-
-from sqlalchemy import func, insert, select, update
+from uuid import UUID
+
+from sqlalchemy import (
+    String,
+    column,
+    func,
+    insert,
+    select,
+    update,
+    values,
+)
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.exception.exceptions import DatabaseError
+from app.core.exception.exceptions import AppException, DatabaseError
 from app.core.log import setup_logger
+from app.core.utils.count_cache import count_cache
+from app.core.utils.image_manifest import image_manifest
+from app.core.utils.paginator import Paginator, mapped_sort_column
+from app.core.utils.search import apply_search
+from app.models.employee import Employee
 from app.models.product import Products, ProductsEmployees
 from app.schemas.pagination import BuildMetadata, PaginationParams
 from app.schemas.product import (
@@ -24,12 +39,17 @@ UPLOAD_FILE = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), 'static'
 )
 
-BASE_IMAGE_DIR = os.path.join(
-    os.path.dirname(os.path.abspath(__file__)), '..', 'static', 'uploads'
-)
-
 URL_IMAGE_PREFIX = '/static/uploads'
 
+# Produtos por UPDATE no backfill (2 binds cada)
+BACKFILL_BATCH_SIZE = 1000
+
+# Passes de enriquecimento feitos na requisição atual. Cada requisição
+# roda em seu próprio contexto asyncio, então o contador começa em zero.
+ENRICHMENT_PASSES: ContextVar[int] = ContextVar(
+    'enrichment_passes', default=0
+)
+
 PRODUCTS_FIELDS = [
     'description',
     'value_operation',
@@ -39,39 +59,48 @@ PRODUCTS_FIELDS = [
 ]
 
 
+def get_enrichment_passes() -> int:
+    return ENRICHMENT_PASSES.get()
+
+
+def reset_enrichment_passes() -> None:
+    ENRICHMENT_PASSES.set(0)
+
+
 class HelpersProducts:
     def _add_images(self, products: List[dict]) -> List[dict]:
-        """Enriquece os produtos com URL de imagem"""
+        """Enriquece os produtos com URL de imagem.
+
+        Único estágio de enriquecimento do pipeline de produtos: é
+        chamado pelo repositório no retorno de cada leitura e não deve
+        ser repetido nas camadas de serviço ou rota.
+        """
+        passes = ENRICHMENT_PASSES.get() + 1
+        ENRICHMENT_PASSES.set(passes)
+        if passes > 1:
+            log.warning(
+                f'Products enriched {passes} times in the same request'
+            )
+
+        manifest_checked = False
+
         enriched_products = []
         for product in products:
             product_dict = dict(product)
-            # Ex: Combo fade → product_images_Combo fade
-            folder_name = f'product_images_{product_dict["description"]}'
-            image_url = None
-
-            # Caminha por todos os diretórios dentro de BASE_IMAGE_DIR
-            for root, dirs, files in os.walk(BASE_IMAGE_DIR):
-                if folder_name in dirs:
-                    full_folder_path = os.path.join(root, folder_name)
-                    image_files = [
-                        f
-                        for f in os.listdir(full_folder_path)
-                        if f.lower().endswith(('.jpg', '.jpeg', '.png'))
-                    ]
-                    if image_files:
-                        # Gera o caminho relativo para servir como URL
-                        relative_path = os.path.relpath(
-                            os.path.join(full_folder_path, image_files[0]),
-                            os.path.join(BASE_IMAGE_DIR),
-                        )
-                        image_url = (
-                            f'{settings.backend_base_url}'
-                            f'{URL_IMAGE_PREFIX}/'
-                            f'{relative_path.replace(os.sep, "/")}'
-                        )
-                    break  # Encontrou a pasta, não precisa continuar
-
-            if not image_url:
+            image_path = product_dict.pop('image_path', None)
+
+            # Produtos anteriores ao backfill caem no manifesto
+            if not image_path:
+                if not manifest_checked:
+                    image_manifest.refresh()
+                    manifest_checked = True
+                image_path = image_manifest.get(
+                    product_dict['description']
+                )
+
+            if image_path:
+                image_url = f'{settings.backend_base_url}/{image_path}'
+            else:
                 image_url = f'{URL_IMAGE_PREFIX}/default.jpg'
 
             product_dict['image_url'] = image_url
@@ -88,13 +117,14 @@ class ProductRepositories(HelpersProducts):
 
     async def add_product(self, data: ProductInSchema) -> dict:
         try:
-            # Gera dict e remove 'image', que não vai para o banco
+            # 'image' é o caminho relativo salvo no upload
             product_dict = data.model_dump()
-            product_dict.pop('image', None)
+            product_dict['image_path'] = product_dict.pop('image', None)
 
             product = Products(**product_dict)
             self.session.add(product)
             await self.session.commit()
+            count_cache.invalidate('products')
             await self.session.refresh(product)
 
             product_out = dict(product.__dict__)
@@ -120,61 +150,43 @@ class ProductRepositories(HelpersProducts):
                 ).label('time_to_spend'),
                 self.product.commission,
                 self.product.category,
-            ).where(self.product.is_deleted.is_(False))
-
-            if pagination_params.filter_by:
-                filter_value = f'%{pagination_params.filter_by}%'
-                stmt = stmt.filter(
-                    func.unaccent(self.product.description).ilike(
-                        filter_value
-                    )
-                )
-
-            if pagination_params.order_by:
-                try:
-                    sort_column = getattr(
-                        self.product, pagination_params.order_by
-                    )
-                    sort_direction = (
-                        pagination_params.sort_by or 'asc'
-                    ).lower()
-                    stmt = stmt.order_by(
-                        sort_column.asc()
-                        if sort_direction == 'asc'
-                        else sort_column.desc()
-                    )
-                except AttributeError:
-                    log.warning(
-                        f'Campo de ordenação inválido: \
-                        {pagination_params.order_by}'
-                    )
+                self.product.image_path,
+            ).where(self.product.is_deleted == False)
 
-            total_count = await self.session.scalar(
-                select(func.count()).select_from(stmt.subquery())
+            stmt = apply_search(
+                stmt, self.product.description, pagination_params
             )
 
-            paginated_stmt = stmt.offset(
-                (pagination_params.current_page - 1)
-                * pagination_params.rows_per_page
-            ).limit(pagination_params.rows_per_page)
-
-            result = await self.session.execute(paginated_stmt)
-            result = result.mappings().all()  # pega como dict-like
-
-            metadata = BuildMetadata(
-                total_count=total_count,
-                current_page=pagination_params.current_page,
-                rows_per_page=pagination_params.rows_per_page,
-                total_pages=(
-                    total_count + pagination_params.rows_per_page - 1
+            sort_column = mapped_sort_column(
+                pagination_params.order_by, self.product
+            )
+            if sort_column is None:
+                log.warning(
+                    f'Campo de ordenação inválido: \
+                    {pagination_params.order_by}'
                 )
-                // pagination_params.rows_per_page,
+                sort_column = self.product.id
+            if (pagination_params.sort_by or 'asc').lower() == 'asc':
+                stmt = stmt.order_by(sort_column.asc())
+            else:
+                stmt = stmt.order_by(sort_column.desc())
+
+            # Página e total numa única ida ao banco
+            result, metadata = await Paginator(
+                self.session, pagination_params, entity='products'
+            ).paginate(
+                stmt,
+                sort_column,
+                self.product.id,
             )
 
             enriched = self._add_images(result)
 
             return enriched, metadata
 
+        except AppException:
+            raise
+
         except SQLAlchemyError as db_err:
             log.error(f'Database error while listing products: {db_err}')
             raise DatabaseError()
@@ -194,8 +206,9 @@ class ProductRepositories(HelpersProducts):
                 ).label('time_to_spend'),
                 self.product.commission,
                 self.product.category,
+                self.product.image_path,
             ).where(
-                self.product.id == id, self.product.is_deleted.is_(False)
+                self.product.id == id, self.product.is_deleted == False
             )
 
             result = await self.session.execute(stmt)
@@ -228,6 +241,7 @@ class ProductRepositories(HelpersProducts):
             )
             await self.session.execute(stmt)
             await self.session.commit()
+            count_cache.invalidate('products')
         except Exception as e:
             self.session.rollback()
             log.error(f'Logger: Error update_product: {e}')
@@ -238,10 +252,11 @@ class ProductRepositories(HelpersProducts):
             stmt = (
                 update(self.product)
                 .where(self.product.id == product_id)
-                .values(is_deleted=True)
+                .values(is_deleted=True, deleted_at=datetime.now())
             )
             await self.session.execute(stmt)
             await self.session.commit()
+            count_cache.invalidate('products')
         except Exception as e:
             self.session.rollback()
             log.error(f'Logger: Error delete_product: {e}')
@@ -275,6 +290,7 @@ class ProductRepositories(HelpersProducts):
                     ).label('time_to_spend'),
                     self.product.commission,
                     self.product.category,
+                    self.product.image_path,
                 )
                 .join(
                     self.products_employee,
@@ -282,6 +298,7 @@ class ProductRepositories(HelpersProducts):
                 )
                 .where(
                     self.products_employee.employee_id == employee_id,
+                    self.products_employee.is_deleted == False,
                     self.product.is_deleted.__eq__(False),
                 )
             )
@@ -296,3 +313,64 @@ class ProductRepositories(HelpersProducts):
             raise DatabaseError(
                 'Erro inesperado ao adicionar produtos ao funcionário'
             )
+
+    async def list_product_employee_ids(
+        self, product_id: UUID
+    ) -> List[UUID]:
+        """Funcionários ativos que executam o produto
+        (products_employees)."""
+        try:
+            stmt = (
+                select(self.products_employee.employee_id)
+                .join(
+                    Employee,
+                    Employee.id == self.products_employee.employee_id,
+                )
+                .where(
+                    self.products_employee.product_id == product_id,
+                    self.products_employee.is_deleted == False,
+                    Employee.is_deleted == False,
+                )
+            )
+            result = await self.session.scalars(stmt)
+            return list(dict.fromkeys(result.all()))
+        except Exception as e:
+            log.error(f'Logger: Error list_product_employee_ids: {e}')
+            raise DatabaseError(
+                'Erro inesperado ao listar funcionários do produto'
+            )
+
+    async def backfill_image_paths(self, images: Dict[str, str]) -> int:
+        """Preenche image_path dos produtos antigos a partir do disco."""
+        try:
+            if not images:
+                return 0
+            # UPDATE ... FROM (VALUES ...) RETURNING: o rowcount de um
+            # executemany no asyncpg é -1, então conta as linhas
+            # devolvidas. Lotes mantêm os binds abaixo do limite.
+            table = self.product.__table__
+            items = list(images.items())
+            total = 0
+            for offset in range(0, len(items), BACKFILL_BATCH_SIZE):
+                source = values(
+                    column('description', String),
+                    column('image_path', String),
+                    name='images',
+                ).data(items[offset : offset + BACKFILL_BATCH_SIZE])
+                stmt = (
+                    update(table)
+                    .where(
+                        table.c.description == source.c.description,
+                        table.c.image_path.is_(None),
+                    )
+                    .values(image_path=source.c.image_path)
+                    .returning(table.c.id)
+                )
+                result = await self.session.execute(stmt)
+                total += len(result.all())
+            await self.session.commit()
+            return total
+        except Exception as e:
+            await self.session.rollback()
+            log.error(f'Logger: Error backfill_image_paths: {e}')
+            raise DatabaseError('Erro ao preencher imagens dos produtos')
@@ -1,25 +1,47 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Tuple
+from uuid import uuid4
 
 from sqlalchemy import func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from app.core.exception.exceptions import DatabaseError
+from app.core.exception.exceptions import (
+    AppException,
+    DatabaseError,
+    InvalidPaginationError,
+    ScheduleConflictError,
+    ScheduleCrossesMonthError,
+)
 from app.core.log import setup_logger
+from app.core.utils.count_cache import count_cache
 from app.core.utils.metadata import Metadata
+from app.core.utils.occupancy import occupancy_store
+from app.core.utils.paginator import Paginator, mapped_sort_column
+from app.core.utils.search import apply_search
+from app.core.utils.singleflight import slot_flight
+from app.db.archive import archive_table
 from app.models.employee import Employee
 from app.models.product import Products
 from app.models.schedule import ScheduleService
 from app.models.users import User
-from app.schemas.pagination import BuildMetadata, PaginationParams
+from app.schemas.pagination import BuildMetadata
 from app.schemas.schedule import (
+    ScheduleBulkItemOut,
+    ScheduleBulkOutSchema,
     ScheduleInSchema,
+    ScheduleListParams,
     ScheduleOutSchema,
     UpdateScheduleInSchema,
 )
 
 log = setup_logger()
 
+# SQLSTATE de exclusion_violation (constraints *_no_overlap)
+EXCLUSION_VIOLATION = '23P01'
+# CHECK que mantém cada agendamento dentro de uma partição mensal
+SINGLE_MONTH_CONSTRAINT = 'ck_schedule_single_month'
+
 SCHEDULE_FIELDS = [
     'product_id',
     'employee_id',
@@ -27,6 +49,25 @@ SCHEDULE_FIELDS = [
 ]
 
 
+def is_overlap(error: Exception) -> bool:
+    orig = getattr(error, 'orig', None)
+    return getattr(orig, 'sqlstate', None) == EXCLUSION_VIOLATION
+
+
+def is_month_crossing(error: Exception) -> bool:
+    return SINGLE_MONTH_CONSTRAINT in str(getattr(error, 'orig', ''))
+
+
+def spans_months(start: datetime, end: datetime) -> bool:
+    """O atendimento termina depois da virada do mês em que começa.
+
+    A constraint de exclusão vale por partição: sobreposições entre
+    meses escapariam dela, então o banco recusa esses agendamentos.
+    """
+    last = end - timedelta(microseconds=1)
+    return (start.year, start.month) != (last.year, last.month)
+
+
 class ScheduleRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -40,6 +81,10 @@ class ScheduleRepository:
             return dt.astimezone(timezone.utc).replace(tzinfo=None)
         return dt
 
+    def _end_time(self):
+        """Fim do atendimento (coluna mantida por trigger)."""
+        return self.schedule.end_time.label('end_time')
+
     async def add_schedule(self, schedule: ScheduleInSchema):
         try:
             stmt = (
@@ -54,12 +99,20 @@ class ScheduleRepository:
                     is_deleted=False,
                     created_at=datetime.now(),
                 )
-                .returning(self.schedule.id)
+                .returning(
+                    self.schedule.id,
+                    self.schedule.employee_id,
+                    self.schedule.time_register,
+                    self.schedule.end_time,
+                )
             )
 
             result = await self.session.execute(stmt)
             await self.session.commit()
-            schedule_id = result.scalar_one()
+            count_cache.invalidate('schedules')
+            schedule_id, employee_id, start, end = result.one()
+            occupancy_store.occupy(employee_id, start, end)
+            slot_flight.invalidate(employee_id)
 
             return ScheduleOutSchema(
                 message_id='schedule_created_successfully',
@@ -68,17 +121,181 @@ class ScheduleRepository:
 
         except Exception as e:
             await self.session.rollback()
+            if is_overlap(e):
+                raise ScheduleConflictError()
+            if is_month_crossing(e):
+                raise ScheduleCrossesMonthError()
             log.error(f'Error adding schedule: {e}')
             raise DatabaseError('Error adding schedule')
 
+    async def add_schedules_bulk(
+        self, items: List[ScheduleInSchema]
+    ) -> ScheduleBulkOutSchema:
+        """
+        Cria vários agendamentos numa única transação.
+
+        Produto, funcionário e conflito de horário (com a agenda existente
+        e dentro do próprio lote) são apurados em memória a partir de três
+        consultas; os itens válidos entram num único INSERT multi-linha.
+        Itens recusados não impedem os demais.
+        """
+        try:
+            durations = dict(
+                (
+                    await self.session.execute(
+                        select(
+                            self.products.id, self.products.time_to_spend
+                        ).where(
+                            self.products.id.in_({
+                                item.product_id for item in items
+                            }),
+                            self.products.is_deleted == False,
+                        )
+                    )
+                ).all()
+            )
+            employees = set(
+                await self.session.scalars(
+                    select(self.employee.id).where(
+                        self.employee.id.in_({
+                            item.employee_id for item in items
+                        }),
+                        self.employee.is_deleted == False,
+                    )
+                )
+            )
+
+            results: List[ScheduleBulkItemOut | None] = [None] * len(items)
+            candidates = []
+            for index, item in enumerate(items):
+                if item.product_id not in durations:
+                    detail = 'product not found'
+                elif item.employee_id not in employees:
+                    detail = 'employee not found'
+                else:
+                    start = self.make_naive(item.time_register)
+                    end = start + durations[item.product_id]
+                    if not spans_months(start, end):
+                        candidates.append((index, item, start, end))
+                        continue
+                    detail = 'appointment crosses a month boundary'
+                results[index] = ScheduleBulkItemOut(
+                    index=index, status='invalid', detail=detail
+                )
+
+            # Agenda atual dos funcionários na janela coberta pelo lote
+            booked: Dict[Any, List[Tuple[datetime, datetime]]] = {}
+            if candidates:
+                window_start = min(c[2] for c in candidates)
+                window_end = max(c[3] for c in candidates)
+                # Atendimento mais longo de qualquer produto: limite
+                # inferior que ainda usa o índice e poda as partições
+                longest = select(
+                    func.max(self.products.time_to_spend)
+                ).scalar_subquery()
+                existing = await self.session.execute(
+                    select(
+                        self.schedule.employee_id,
+                        self.schedule.time_register,
+                        self._end_time(),
+                    ).where(
+                        self.schedule.employee_id.in_({
+                            c[1].employee_id for c in candidates
+                        }),
+                        self.schedule.is_deleted == False,
+                        self.schedule.time_register < window_end,
+                        self.schedule.time_register
+                        > window_start - longest,
+                    )
+                )
+                for employee_id, start, end in existing:
+                    booked.setdefault(employee_id, []).append((start, end))
+
+            now = datetime.now()
+            rows = []
+            for index, item, start, end in candidates:
+                taken = booked.setdefault(item.employee_id, [])
+                if any(s < end and start < e for s, e in taken):
+                    results[index] = ScheduleBulkItemOut(
+                        index=index,
+                        status='conflict',
+                        detail='time slot already booked',
+                    )
+                    continue
+                taken.append((start, end))
+                schedule_id = uuid4()
+                rows.append({
+                    'id': schedule_id,
+                    'time_register': start,
+                    'product_id': item.product_id,
+                    'employee_id': item.employee_id,
+                    'user_id': item.user_id,
+                    'is_check': False,
+                    'is_awayalone': False,
+                    'is_deleted': False,
+                    'created_at': now,
+                })
+                results[index] = ScheduleBulkItemOut(
+                    index=index, status='created', schedule_id=schedule_id
+                )
+
+            if rows:
+                # ids gerados aqui: o RETURNING só confirma o que entrou
+                inserted = set(
+                    await self.session.scalars(
+                        insert(self.schedule)
+                        .values(rows)
+                        .returning(self.schedule.id)
+                    )
+                )
+                await self.session.commit()
+                count_cache.invalidate('schedules')
+                for index, item, start, end in candidates:
+                    if results[index].schedule_id in inserted:
+                        occupancy_store.occupy(
+                            item.employee_id, start, end
+                        )
+                for employee_id in {row['employee_id'] for row in rows}:
+                    slot_flight.invalidate(employee_id)
+
+            return ScheduleBulkOutSchema(
+                created=len(rows), results=results
+            )
+
+        except Exception as e:
+            await self.session.rollback()
+            if is_overlap(e):
+                # Outro writer ocupou o horário depois da checagem
+                raise ScheduleConflictError()
+            log.error(f'Error adding schedules in bulk: {e}')
+            raise DatabaseError('Error adding schedules in bulk')
+
     async def list_schedule(
-        self, pagination_params: PaginationParams
+        self, pagination_params: ScheduleListParams
     ) -> Tuple[List[Dict[str, Any]], BuildMetadata]:
+        """
+        Lista os agendamentos em aberto.
+
+        ``start``/``end`` limitam ``time_register`` e ``employee_id``
+        restringe a um funcionário; com a ordenação padrão por
+        ``time_register`` a visão do dia lê só as linhas que retorna
+        (índice ``(employee_id, time_register)``). ``archived`` lê o
+        histórico movido para ``archive.schedule``: excluídos e
+        atendidos, inclusive de clientes e funcionários já arquivados.
+        """
+        archived = pagination_params.archived
+        schedule = self.schedule
+        if archived:
+            schedule = aliased(
+                ScheduleService,
+                archive_table(ScheduleService.__table__),
+                adapt_on_names=True,
+            )
         try:
             stmt = (
                 select(
-                    self.schedule.id,
-                    self.schedule.time_register,
+                    schedule.id,
+                    schedule.time_register,
                     self.employee.id.label('employee_id'),
                     self.products.id.label('product_id'),
                     self.products.description.label('product_name'),
@@ -88,86 +305,91 @@ class ScheduleRepository:
                     self.user.phone.label('phone'),
                     self.user.username.label('name_client'),
                     (
-                        self.schedule.time_register
+                        schedule.time_register
                         + self.products.time_to_spend
                     ).label('end_time'),
                     self.employee.username.label('name_employee'),
                 )
                 .join(
                     self.employee,
-                    self.schedule.employee_id == self.employee.id,
+                    schedule.employee_id == self.employee.id,
+                    isouter=archived,
                 )
                 .join(
                     self.products,
-                    self.schedule.product_id == self.products.id,
+                    schedule.product_id == self.products.id,
+                    isouter=archived,
                 )
-                .join(self.user, self.schedule.user_id == self.user.id)
-                .where(
-                    self.schedule.is_deleted == False,
-                    self.schedule.is_check == False,
+                .join(
+                    self.user,
+                    schedule.user_id == self.user.id,
+                    isouter=archived,
                 )
             )
+            if not archived:
+                stmt = stmt.where(
+                    schedule.is_deleted == False,
+                    schedule.is_check == False,
+                )
 
-            # Filtro por nome
-            if pagination_params.filter_by:
-                filter_value = f'%{pagination_params.filter_by}%'
-                try:
-                    stmt = stmt.filter(
-                        func.unaccent(self.user.username).ilike(
-                            func.unaccent(filter_value)
-                        )
-                    )
-                except Exception:
-                    stmt = stmt.filter(
-                        self.user.username.ilike(filter_value)
-                    )
+            # Filtro por nome (trigramas, com ranking opcional)
+            stmt = apply_search(
+                stmt, self.user.username, pagination_params
+            )
 
-            # Ordenação
-            if pagination_params.order_by:
-                try:
-                    sort_column = getattr(
-                        self.user, pagination_params.order_by
-                    )
-                    sort_direction = (
-                        pagination_params.sort_by or 'asc'
-                    ).lower()
-                    stmt = stmt.order_by(
-                        sort_column.asc()
-                        if sort_direction == 'asc'
-                        else sort_column.desc()
-                    )
-                except AttributeError:
-                    log.warning(
-                        f'Logger: Campo de ordenação inválido: \
-                        {pagination_params.order_by}'
-                    )
+            # Janela da agenda e funcionário
+            start, end = pagination_params.start, pagination_params.end
+            if start and end and end <= start:
+                raise InvalidPaginationError(
+                    'end deve ser posterior a start'
+                )
+            if start:
+                stmt = stmt.where(
+                    schedule.time_register >= self.make_naive(start)
+                )
+            if end:
+                stmt = stmt.where(
+                    schedule.time_register < self.make_naive(end)
+                )
+            if pagination_params.employee_id:
+                stmt = stmt.where(
+                    schedule.employee_id == pagination_params.employee_id
+                )
 
-            # Total de registros
-            total_count = await self.session.execute(
-                select(func.count()).select_from(stmt.subquery())
+            # Ordenação (padrão: time_register), id como desempate
+            # do agendamento ou, senão, do cliente
+            sort_column = mapped_sort_column(
+                pagination_params.order_by, schedule, self.user
             )
-            total_count = total_count.scalar()
-
-            # Paginação
-            paginated_stmt = stmt.offset(
-                (pagination_params.current_page - 1)
-                * pagination_params.rows_per_page
-            ).limit(pagination_params.rows_per_page)
-
-            result = await self.session.execute(paginated_stmt)
-            result = result.all()
-
-            metadata = BuildMetadata(
-                total_count=total_count,
-                current_page=pagination_params.current_page,
-                rows_per_page=pagination_params.rows_per_page,
-                total_pages=(
-                    total_count + pagination_params.rows_per_page - 1
+            if sort_column is None:
+                log.warning(
+                    f'Logger: Campo de ordenação inválido: \
+                    {pagination_params.order_by}'
                 )
-                // pagination_params.rows_per_page,
-            )
+                sort_column = schedule.time_register
+            if (pagination_params.sort_by or 'asc').lower() == 'asc':
+                stmt = stmt.order_by(sort_column.asc(), schedule.id.asc())
+            else:
+                stmt = stmt.order_by(
+                    sort_column.desc(), schedule.id.desc()
+                )
+
+            # Página e total numa única ida ao banco
+            result, metadata = await Paginator(
+                self.session,
+                pagination_params,
+                entity='schedules',
+                filters=(
+                    start,
+                    end,
+                    pagination_params.employee_id,
+                    archived,
+                ),
+            ).paginate(stmt, sort_column, schedule.id)
             return Metadata(result).model_to_list(), metadata
 
+        except AppException:
+            raise
         except Exception as e:
             self.session.rollback()
             log.error(f'Error listing schedules: {e}')
@@ -216,9 +438,20 @@ class ScheduleRepository:
         self, id: int, data: UpdateScheduleInSchema
     ) -> ScheduleOutSchema:
         try:
+            # Valores anteriores para liberar a ocupação antiga
+            old = (
+                select(
+                    self.schedule.id,
+                    self.schedule.employee_id,
+                    self.schedule.time_register,
+                    self._end_time(),
+                )
+                .where(self.schedule.id == id)
+                .subquery('old')
+            )
             stmt = (
                 update(self.schedule)
-                .where(self.schedule.id == id)
+                .where(self.schedule.id == old.c.id)
                 .values(
                     **{
                         k: v
@@ -227,18 +460,36 @@ class ScheduleRepository:
                     },
                     updated_at=datetime.now(),
                 )
+                .returning(
+                    old.c.employee_id,
+                    old.c.time_register,
+                    old.c.end_time,
+                    self.schedule.employee_id,
+                    self.schedule.time_register,
+                    self._end_time(),
+                )
             )
             result = await self.session.execute(stmt)
-            if result.rowcount == 0:
+            row = result.one_or_none()
+            if row is None:
                 raise ValueError(f'Schedule with ID {id} not found.')
 
             await self.session.commit()
+            count_cache.invalidate('schedules')
+            occupancy_store.release(row[0], row[1], row[2])
+            occupancy_store.occupy(row[3], row[4], row[5])
+            slot_flight.invalidate(row[0])
+            slot_flight.invalidate(row[3])
             return ScheduleOutSchema(
                 message_id='schedule_updated_successfully'
             )
 
         except Exception as e:
             await self.session.rollback()
+            if is_overlap(e):
+                raise ScheduleConflictError()
+            if is_month_crossing(e):
+                raise ScheduleCrossesMonthError()
             log.error(f'Error updating schedule: {e}')
             raise DatabaseError('Error updating schedule')
 
@@ -247,10 +498,19 @@ class ScheduleRepository:
             stmt = (
                 update(self.schedule)
                 .where(self.schedule.id == id)
-                .values(is_deleted=True)
+                .values(is_deleted=True, deleted_at=datetime.now())
+                .returning(
+                    self.schedule.employee_id,
+                    self.schedule.time_register,
+                    self._end_time(),
+                )
             )
-            await self.session.execute(stmt)
+            result = await self.session.execute(stmt)
             await self.session.commit()
+            count_cache.invalidate('schedules')
+            for employee_id, start, end in result.all():
+                occupancy_store.release(employee_id, start, end)
+                slot_flight.invalidate(employee_id)
             return ScheduleOutSchema(
                 message_id='schedule_deleted_successfully'
             )
@@ -271,6 +531,7 @@ class ScheduleRepository:
             )
             result = await self.session.execute(stmt)
             await self.session.commit()
+            count_cache.invalidate('schedules')
             return result.scalar_one_or_none()
         except Exception as e:
             self.session.rollback()
@@ -1,16 +1,31 @@
+from datetime import datetime
+
 from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exception.exceptions import DatabaseError
 from app.core.log import setup_logger
 from app.core.utils.metadata import Metadata
+from app.core.utils.occupancy import occupancy_store
+from app.core.utils.singleflight import slot_flight
+from app.core.utils.working_hours import working_hours_cache
 from app.models.block import ScheduleBlock
 from app.models.time_recording import ScheduleEmployee
 from app.schemas.schedule import ScheduleInBlock
-from app.schemas.service import ScheduleEmployeeOut
+from app.schemas.service import ScheduleEmployeeOut, WorkingHoursIn
 
 log = setup_logger()
 
+# Montada uma vez: recarregada a cada expiração do working_hours_cache
+WORKING_HOURS = select(
+    ScheduleEmployee.employee_id,
+    ScheduleEmployee.weekday,
+    ScheduleEmployee.start_time,
+    ScheduleEmployee.lunch_start,
+    ScheduleEmployee.lunch_end,
+    ScheduleEmployee.end_time,
+).where(ScheduleEmployee.is_deleted == False)
+
 
 class ServiceScheduleRepository:
     def __init__(self, session: AsyncSession):
@@ -25,6 +40,12 @@ class ServiceScheduleRepository:
             )
             await self.session.execute(new_block)
             await self.session.commit()
+            occupancy_store.occupy(
+                block_data.employee_id,
+                block_data.start_time,
+                block_data.end_time,
+            )
+            slot_flight.invalidate(block_data.employee_id)
             return ScheduleEmployeeOut(message_id='added_block')
         except Exception:
             await self.session.rollback()
@@ -51,13 +72,56 @@ class ServiceScheduleRepository:
             stmt = (
                 update(self.schedule_block)
                 .where(self.schedule_block.id == block_id)
-                .values(is_deleted=True)
+                .values(is_deleted=True, deleted_at=datetime.now())
+                .returning(
+                    self.schedule_block.employee_id,
+                    self.schedule_block.start_time,
+                    self.schedule_block.end_time,
+                )
             )
-            await self.session.execute(stmt)
+            result = await self.session.execute(stmt)
             await self.session.commit()
+            for employee_id, start, end in result.all():
+                occupancy_store.release(employee_id, start, end)
+                slot_flight.invalidate(employee_id)
             return ScheduleEmployeeOut(message_id='delete_block_success')
 
         except Exception as e:
             await self.session.rollback()
             log.error(f'Error deleting block {block_id}: {e}')
             raise DatabaseError('Error deleting block from the database')
+
+    async def list_working_hours(self):
+        try:
+            result = await self.session.execute(WORKING_HOURS)
+            return result.all()
+        except Exception as e:
+            log.error(f'Error fetching working hours: {e}')
+            raise DatabaseError('Failed to fetch working hours')
+
+    async def set_working_hours(self, data: WorkingHoursIn):
+        """Substitui a jornada do funcionário no dia da semana."""
+        try:
+            now = datetime.now()
+            await self.session.execute(
+                update(self.schedule_employee)
+                .where(
+                    self.schedule_employee.employee_id == data.employee_id,
+                    self.schedule_employee.weekday == data.weekday,
+                    self.schedule_employee.is_deleted == False,
+                )
+                .values(is_deleted=True, deleted_at=now)
+            )
+            await self.session.execute(
+                insert(self.schedule_employee).values(
+                    **data.model_dump(), created_at=now, is_deleted=False
+                )
+            )
+            await self.session.commit()
+            working_hours_cache.invalidate()
+            slot_flight.invalidate(data.employee_id)
+            return ScheduleEmployeeOut(message_id='working_hours_saved')
+        except Exception as e:
+            await self.session.rollback()
+            log.error(f'Error saving working hours: {e}')
+            raise DatabaseError('Failed to save working hours')
@@ -1,23 +1,95 @@
-from datetime import datetime, timedelta
-from typing import Dict, List
+import heapq
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import any_, bindparam, select, union_all
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.exception.exceptions import DatabaseError
+from app.core.exception.exceptions import AppException, DatabaseError
+from app.core.exception.product import ProductNotFoundError
 from app.core.log import setup_logger
+from app.core.utils.availability import AvailabilityEngine, Interval
+from app.core.utils.occupancy import (
+    days_between,
+    diff_ranges,
+    free_slots,
+    mask_from_intervals,
+    occupancy_store,
+)
+from app.core.utils.working_hours import WorkingHours, working_hours_cache
 from app.models.block import ScheduleBlock
+from app.models.product import Products
 from app.models.schedule import ScheduleService
-from app.schemas.slots import SlotsInSchema
+from app.repositories.service_schedule import ServiceScheduleRepository
+from app.schemas.slots import (
+    NextSlotsInSchema,
+    SlotsBatchInSchema,
+    SlotsInSchema,
+)
 
 log = setup_logger()
 
+# Limite inferior para a busca por intervalo continuar usando índice:
+# nenhum atendimento dura mais que isso.
+MAX_APPOINTMENT = timedelta(hours=12)
+
+# Consultas do cálculo de slots montadas uma vez, com parâmetros: sem
+# reconstruir o select() nem recalcular a chave de cache por requisição
+PRODUCT_DURATION = select(Products.time_to_spend).where(
+    Products.id == bindparam('product_id'), Products.is_deleted == False
+)
+
+# = ANY($n) com um array: o mesmo SQL (e prepared statement) para
+# qualquer quantidade de funcionários, ao contrário do IN expandido
+EMPLOYEE_IDS = bindparam(
+    'employee_ids', type_=ARRAY(PG_UUID(as_uuid=True))
+)
+
+BUSY_INTERVALS = union_all(
+    select(
+        ScheduleService.employee_id.label('employee_id'),
+        ScheduleService.time_register.label('start'),
+        (ScheduleService.time_register + Products.time_to_spend).label(
+            'end'
+        ),
+    )
+    .join(Products, ScheduleService.product_id == Products.id)
+    .where(
+        ScheduleService.employee_id == any_(EMPLOYEE_IDS),
+        ScheduleService.is_deleted == False,
+        # start - MAX_APPOINTMENT
+        ScheduleService.time_register >= bindparam('earliest'),
+        ScheduleService.time_register < bindparam('end'),
+    ),
+    select(
+        ScheduleBlock.employee_id.label('employee_id'),
+        ScheduleBlock.start_time.label('start'),
+        ScheduleBlock.end_time.label('end'),
+    ).where(
+        ScheduleBlock.employee_id == any_(EMPLOYEE_IDS),
+        ScheduleBlock.is_deleted == False,
+        ScheduleBlock.start_time < bindparam('end'),
+        ScheduleBlock.end_time > bindparam('start'),
+    ),
+)
+
 
 class SlotsRepositories:
     def __init__(self, session: AsyncSession):
         self.session = session
         self.schedule = ScheduleService
         self.block = ScheduleBlock
+        self.products = Products
+
+    def make_naive(self, dt: datetime) -> datetime:
+        # Horários gravados sem fuso; como ScheduleRepository.make_naive
+        if dt.tzinfo:
+            return dt.astimezone(timezone.utc).replace(tzinfo=None)
+        return dt
 
     async def list_slots(
         self,
@@ -28,12 +100,16 @@ class SlotsRepositories:
 
         Args:
             employee_id (int): ID do funcionário.
-            work_start (str): Hora inicial do expediente (HH:MM).
-            work_end (str): Hora final do expediente (HH:MM).
+            work_start (str, optional): Hora inicial do expediente \
+                (HH:MM). Default: jornada do funcionário no dia.
+            work_end (str, optional): Hora final do expediente \
+                (HH:MM). Default: jornada do funcionário no dia.
             slot_minutes (int, optional): Duração do slot em minutos. \
                 Default: 30.
             target_date (date, optional): Data para gerar os slots. \
                 Default: hoje.
+            product_id (UUID, optional): Serviço desejado; só são \
+                oferecidos slots que comportam seu time_to_spend.
 
         Returns:
             List[Dict[str, datetime]]: \
@@ -42,54 +118,351 @@ class SlotsRepositories:
         try:
             target_date = data.target_date or datetime.now().date()
 
-            # 1. Intervalo de trabalho
-            start_dt = datetime.combine(
+            # 1. Expediente: informado pelo cliente ou jornada cadastrada
+            hours = await self.get_working_hours(
+                data.employee_id,
                 target_date,
-                datetime.strptime(data.work_start, '%H:%M').time(),
+                data.work_start,
+                data.work_end,
             )
-            end_dt = datetime.combine(
+            if not hours:
+                return []
+            start_dt, end_dt = hours.window(target_date)
+
+            # 2. Duração do serviço pedido (se houver)
+            length = None
+            if data.product_id:
+                length = await self.get_product_duration(data.product_id)
+
+            # 3. Ocupação do dia: bitmap em memória ou uma consulta
+            mask = await self.get_occupancy(data.employee_id, target_date)
+
+            # 4. Slots livres por operações de bits
+            mask |= mask_from_intervals(
+                target_date, hours.breaks(target_date)
+            )
+            return free_slots(
+                mask,
                 target_date,
-                datetime.strptime(data.work_end, '%H:%M').time(),
+                start_dt,
+                end_dt,
+                data.slot_minutes,
+                length,
             )
 
-            # 2. Gera slots brutos
-            slots = []
-            current = start_dt
-            while current < end_dt:
-                slots.append({
-                    'start': current,
-                    'end': current + timedelta(minutes=data.slot_minutes),
-                })
-                current += timedelta(minutes=data.slot_minutes)
-
-            # 3. Pega agendamentos existentes
-            scheduled = await self.session.scalars(
-                select(self.schedule.time_register).where(
-                    self.schedule.employee_id == data.employee_id,
-                    self.schedule.is_deleted == False,
+        except AppException:
+            raise
+        except Exception as e:
+            log.error(f'Error in list_slots: {e}', exc_info=True)
+            raise DatabaseError('Error in list_slots')
+
+    async def list_slots_batch(
+        self, data: SlotsBatchInSchema, employee_ids: List[UUID]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Gera a disponibilidade de vários funcionários em vários dias.
+
+        Agendamentos e bloqueios de todo o período são lidos numa única
+        consulta e particionados em memória por funcionário; os slots de
+        cada dia são calculados sob demanda, à medida que o resultado é
+        consumido.
+
+        Returns:
+            Iterator[Dict[str, Any]]: um item por funcionário e dia, com \
+            employee_id, date e slots.
+        """
+        days = [
+            data.start_date + timedelta(days=offset)
+            for offset in range((data.end_date - data.start_date).days + 1)
+        ]
+        try:
+            length = None
+            if data.product_id:
+                length = await self.get_product_duration(data.product_id)
+
+            shifts = await self.get_shifts(
+                employee_ids, days, data.work_start, data.work_end
+            )
+
+            busy = await self.list_busy_intervals(
+                employee_ids,
+                datetime.combine(days[0], time.min),
+                datetime.combine(days[-1] + timedelta(days=1), time.min),
+            )
+        except AppException:
+            raise
+        except Exception as e:
+            log.error(f'Error in list_slots_batch: {e}', exc_info=True)
+            raise DatabaseError('Error in list_slots_batch')
+
+        def groups() -> Iterator[Dict[str, Any]]:
+            for employee_id in employee_ids:
+                employee_shifts = shifts[employee_id]
+                breaks = [
+                    interval
+                    for day, hours in employee_shifts.items()
+                    for interval in hours.breaks(day)
+                ]
+                engine = AvailabilityEngine(
+                    busy.get(employee_id, []) + breaks
                 )
+                for day in days:
+                    hours = employee_shifts.get(day)
+                    slots = []
+                    if hours:
+                        start_dt, end_dt = hours.window(day)
+                        slots = engine.free_slots(
+                            start_dt, end_dt, data.slot_minutes, length
+                        )
+                    yield {
+                        'employee_id': employee_id,
+                        'date': day,
+                        'slots': slots,
+                    }
+
+        return groups()
+
+    async def first_available(
+        self, data: NextSlotsInSchema, employee_ids: List[UUID]
+    ) -> List[Dict[str, Any]]:
+        """
+        Primeiros ``limit`` horários livres entre vários funcionários.
+
+        Cada funcionário vira um fluxo de slots em ordem cronológica,
+        calculado dia a dia sob demanda; os fluxos são intercalados por
+        um merge k-way (heap) e a busca para assim que ``limit`` slots
+        são encontrados. A janela consultada começa em um dia e dobra a
+        cada rodada sem resultados suficientes, com uma única consulta
+        de ocupação por rodada.
+        """
+        try:
+            length = await self.get_product_duration(data.product_id)
+            not_before = self.make_naive(data.not_before or datetime.now())
+            horizon_end = not_before.date() + timedelta(
+                days=data.horizon_days
             )
-            scheduled_times = set(scheduled.all())
 
-            # 4. Pega bloqueios
-            block_results = await self.session.execute(
-                select(self.block.start_time, self.block.end_time).where(
-                    self.block.employee_id == data.employee_id
+            found: List[Dict[str, Any]] = []
+            window_start = not_before.date()
+            window_days = 1
+            while len(found) < data.limit and window_start < horizon_end:
+                window_end = min(
+                    window_start + timedelta(days=window_days), horizon_end
+                )
+                days = [
+                    window_start + timedelta(days=offset)
+                    for offset in range((window_end - window_start).days)
+                ]
+                shifts = await self.get_shifts(employee_ids, days)
+                busy = await self.list_busy_intervals(
+                    employee_ids,
+                    datetime.combine(window_start, time.min),
+                    datetime.combine(window_end, time.min),
                 )
+
+                streams = [
+                    self._slot_stream(
+                        employee_id,
+                        shifts[employee_id],
+                        busy.get(employee_id, []),
+                        data.slot_minutes,
+                        length,
+                        not_before,
+                    )
+                    for employee_id in employee_ids
+                ]
+                for start, employee_id, end in heapq.merge(*streams):
+                    found.append({
+                        'employee_id': employee_id,
+                        'start': start,
+                        'end': end,
+                    })
+                    if len(found) == data.limit:
+                        break
+
+                window_start = window_end
+                window_days *= 2
+
+            return found
+
+        except AppException:
+            raise
+        except Exception as e:
+            log.error(f'Error in first_available: {e}', exc_info=True)
+            raise DatabaseError('Error in first_available')
+
+    @staticmethod
+    def _slot_stream(
+        employee_id: UUID,
+        shifts: Dict[date, WorkingHours],
+        busy: List[Interval],
+        slot_minutes: int,
+        length: timedelta,
+        not_before: datetime,
+    ) -> Iterator[Tuple[datetime, UUID, datetime]]:
+        """Slots livres de um funcionário, em ordem, um dia por vez."""
+        breaks = [
+            interval
+            for day, hours in shifts.items()
+            for interval in hours.breaks(day)
+        ]
+        engine = AvailabilityEngine(busy + breaks)
+        for day in sorted(shifts):
+            start_dt, end_dt = shifts[day].window(day)
+            for slot in engine.free_slots(
+                start_dt, end_dt, slot_minutes, length
+            ):
+                if slot['start'] >= not_before:
+                    yield slot['start'], employee_id, slot['end']
+
+    async def get_shifts(
+        self,
+        employee_ids: List[UUID],
+        days: List[date],
+        work_start: Optional[str] = None,
+        work_end: Optional[str] = None,
+    ) -> Dict[UUID, Dict[date, WorkingHours]]:
+        """Expediente de cada funcionário nos dias em que trabalha."""
+        shifts: Dict[UUID, Dict[date, WorkingHours]] = {}
+        for employee_id in employee_ids:
+            shifts[employee_id] = {}
+            for day in days:
+                hours = await self.get_working_hours(
+                    employee_id, day, work_start, work_end
+                )
+                if hours:
+                    shifts[employee_id][day] = hours
+        return shifts
+
+    async def get_working_hours(
+        self,
+        employee_id: UUID,
+        day: date,
+        work_start: Optional[str] = None,
+        work_end: Optional[str] = None,
+    ) -> Optional[WorkingHours]:
+        """Expediente do dia; sem horário informado, usa a jornada."""
+        if work_start and work_end:
+            return WorkingHours(
+                start_time=datetime.strptime(work_start, '%H:%M').time(),
+                end_time=datetime.strptime(work_end, '%H:%M').time(),
             )
-            blocks = block_results.all()
+        return await working_hours_cache.get(
+            employee_id,
+            day,
+            ServiceScheduleRepository(self.session).list_working_hours,
+        )
 
-            # 5. Filtra slots
-            available = []
-            for slot in slots:
-                if slot['start'] in scheduled_times:
-                    continue
-                if any(b[0] <= slot['start'] < b[1] for b in blocks):
-                    continue
-                available.append(slot)
+    async def get_occupancy(self, employee_id: UUID, day: date) -> int:
+        """Bitmap de ocupação do dia, carregado sob demanda."""
+        mask = occupancy_store.get(employee_id, day)
+        if mask is None:
+            version = occupancy_store.version(employee_id, day)
+            mask = await self._load_occupancy(employee_id, day)
+            occupancy_store.put(employee_id, day, mask, version)
+        return mask
 
-            return available
+    async def check_occupancy(self) -> List[Dict[str, Any]]:
+        """
+        Reconstrói do banco cada dia em cache e compara com o bitmap.
 
+        Uma única consulta de ocupação cobre todos os funcionários e
+        dias em cache; os intervalos são separados por dia em memória.
+        Dias divergentes são corrigidos no cache e reportados com os
+        trechos (start/end) em que o bitmap estava errado.
+        """
+        try:
+            cached_days, versions = {}, {}
+            for employee_id, day in occupancy_store.keys():
+                mask = occupancy_store.get(employee_id, day)
+                if mask is not None:
+                    cached_days[(employee_id, day)] = mask
+                    versions[(employee_id, day)] = occupancy_store.version(
+                        employee_id, day
+                    )
+            if not cached_days:
+                return []
+
+            days = [day for _, day in cached_days]
+            busy = await self.list_busy_intervals(
+                list({employee_id for employee_id, _ in cached_days}),
+                datetime.combine(min(days), time.min),
+                datetime.combine(max(days) + timedelta(days=1), time.min),
+            )
+            by_day: Dict[Tuple[UUID, date], List[Interval]] = defaultdict(
+                list
+            )
+            for employee_id, intervals in busy.items():
+                for start, end in intervals:
+                    for day in days_between(start, end):
+                        by_day[(employee_id, day)].append((start, end))
+
+            report = []
+            for (employee_id, day), cached in cached_days.items():
+                expected = mask_from_intervals(
+                    day, by_day.get((employee_id, day), [])
+                )
+                if expected != cached:
+                    occupancy_store.put(
+                        employee_id,
+                        day,
+                        expected,
+                        versions[(employee_id, day)],
+                    )
+                    report.append({
+                        'employee_id': employee_id,
+                        'date': day,
+                        'ranges': [
+                            {'start': start, 'end': end}
+                            for start, end in diff_ranges(
+                                day, expected, cached
+                            )
+                        ],
+                    })
+            return report
         except Exception as e:
-            log.error(f'Error in list_slots: {e}', exc_info=True)
-            DatabaseError('Error in list_slots')
+            log.error(f'Error in check_occupancy: {e}', exc_info=True)
+            raise DatabaseError('Error in check_occupancy')
+
+    async def _load_occupancy(self, employee_id: UUID, day: date) -> int:
+        midnight = datetime.combine(day, time.min)
+        busy = await self.list_busy_intervals(
+            [employee_id], midnight, midnight + timedelta(days=1)
+        )
+        return mask_from_intervals(day, busy.get(employee_id, []))
+
+    async def get_product_duration(self, product_id: UUID) -> timedelta:
+        duration = await self.session.scalar(
+            PRODUCT_DURATION, {'product_id': product_id}
+        )
+        if duration is None:
+            raise ProductNotFoundError(product_id)
+        return duration
+
+    async def list_busy_intervals(
+        self,
+        employee_ids: List[UUID],
+        start_dt: datetime,
+        end_dt: datetime,
+    ) -> Dict[UUID, List[Interval]]:
+        """Intervalos ocupados que cruzam [start_dt, end_dt).
+
+        Cada agendamento ocupa ``time_register + time_to_spend``, como em
+        ``ScheduleRepository.list_schedule``. Agendamentos e bloqueios de
+        todos os funcionários vêm numa única consulta (UNION ALL) e são
+        agrupados por funcionário em memória.
+        """
+        rows = await self.session.execute(
+            BUSY_INTERVALS,
+            {
+                'employee_ids': list(employee_ids),
+                'earliest': start_dt - MAX_APPOINTMENT,
+                'start': start_dt,
+                'end': end_dt,
+            },
+        )
+
+        busy: Dict[UUID, List[Interval]] = defaultdict(list)
+        for employee_id, start, end in rows.all():
+            busy[employee_id].append((start, end))
+        return busy
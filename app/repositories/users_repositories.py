@@ -1,11 +1,15 @@
+from datetime import datetime
 from typing import Any, Dict, List, Tuple
 
-from sqlalchemy import func, insert, select, update
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.exception.exceptions import DatabaseError
+from app.core.exception.exceptions import AppException, DatabaseError
 from app.core.log import setup_logger
+from app.core.utils.count_cache import count_cache
 from app.core.utils.metadata import Metadata
+from app.core.utils.paginator import Paginator, mapped_sort_column
+from app.core.utils.search import apply_search
 from app.models.users import User
 from app.schemas.pagination import BuildMetadata, PaginationParams
 from app.schemas.users import (
@@ -48,6 +52,7 @@ class UserRepositories:
             )
             result = await self.session.execute(stmt)
             await self.session.commit()
+            count_cache.invalidate('users')
 
             row = result.fetchone()
             return dict(row._mapping) if row else {}
@@ -76,66 +81,38 @@ class UserRepositories:
                 self.user.phone,
             ).where(self.user.is_deleted.__eq__(False))
 
-            # Filtro por nome
-            if pagination_params.filter_by:
-                filter_value = f'%{pagination_params.filter_by}%'
-                try:
-                    stmt = stmt.filter(
-                        func.unaccent(self.user.username).ilike(
-                            func.unaccent(filter_value)
-                        )
-                    )
-                except Exception:
-                    stmt = stmt.filter(
-                        self.user.username.ilike(filter_value)
-                    )
+            # Filtro por nome (trigramas, com ranking opcional)
+            stmt = apply_search(
+                stmt, self.user.username, pagination_params
+            )
 
             # Ordenação
-            if pagination_params.order_by:
-                try:
-                    sort_column = getattr(
-                        self.user, pagination_params.order_by
-                    )
-                    sort_direction = (
-                        pagination_params.sort_by or 'asc'
-                    ).lower()
-                    stmt = stmt.order_by(
-                        sort_column.asc()
-                        if sort_direction == 'asc'
-                        else sort_column.desc()
-                    )
-                except AttributeError:
-                    log.warning(
-                        f'Logger: Campo de ordenação inválido: \
-                        {pagination_params.order_by}'
-                    )
-
-            # Total de registros
-            total_count = await self.session.execute(
-                select(func.count()).select_from(stmt.subquery())
+            sort_column = mapped_sort_column(
+                pagination_params.order_by, self.user
             )
-            total_count = total_count.scalar()
-
-            # Paginação
-            paginated_stmt = stmt.offset(
-                (pagination_params.current_page - 1)
-                * pagination_params.rows_per_page
-            ).limit(pagination_params.rows_per_page)
-
-            result = await self.session.execute(paginated_stmt)
-            result = result.all()
-
-            metadata = BuildMetadata(
-                total_count=total_count,
-                current_page=pagination_params.current_page,
-                rows_per_page=pagination_params.rows_per_page,
-                total_pages=(
-                    total_count + pagination_params.rows_per_page - 1
+            if sort_column is None:
+                log.warning(
+                    f'Logger: Campo de ordenação inválido: \
+                    {pagination_params.order_by}'
                 )
-                // pagination_params.rows_per_page,
+                sort_column = self.user.id
+            if (pagination_params.sort_by or 'asc').lower() == 'asc':
+                stmt = stmt.order_by(sort_column.asc())
+            else:
+                stmt = stmt.order_by(sort_column.desc())
+
+            # Página e total numa única ida ao banco
+            result, metadata = await Paginator(
+                self.session, pagination_params, entity='users'
+            ).paginate(
+                stmt,
+                sort_column,
+                self.user.id,
             )
             return Metadata(result).model_to_list(), metadata
 
+        except AppException:
+            raise
         except Exception as e:
             log.error(f'Error listing users: {e}')
             raise DatabaseError('Error listing users from the database')
@@ -161,6 +138,9 @@ class UserRepositories:
                 )
                 await self.session.execute(stmt)
                 await self.session.commit()
+                count_cache.invalidate('users')
+                # filter_by dos agendamentos busca pelo nome do cliente
+                count_cache.invalidate('schedules')
 
             return UserUpdateOut(message_id='user_updated_successfully')
 
@@ -173,10 +153,11 @@ class UserRepositories:
             stmt = (
                 update(self.user)
                 .where(self.user.id == user_id)
-                .values(is_deleted=True)
+                .values(is_deleted=True, deleted_at=datetime.now())
             )
             await self.session.execute(stmt)
             await self.session.commit()
+            count_cache.invalidate('users')
             return UserDeleteOut(message_id='user_deleted_successfully')
 
         except Exception as e:
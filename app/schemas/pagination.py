@@ -1,6 +1,6 @@
 # app/schemas/pagination.py
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -11,6 +11,13 @@ class PaginationParams(BaseModel):
     order_by: str = 'id'
     sort_by: str = 'asc'
     filter_by: Optional[str] = None
+    # 'similar' aceita grafias próximas e ordena por similaridade
+    search_mode: Literal['contains', 'similar'] = 'contains'
+    # 'cursor' troca OFFSET por keyset; o cursor vem do metadata anterior
+    pagination_mode: Literal['offset', 'cursor'] = 'offset'
+    cursor: Optional[str] = None
+    # 'estimated' usa a estimativa do planner no lugar do count(*)
+    count_mode: Literal['exact', 'estimated'] = 'exact'
 
 
 class BuildMetadata(BaseModel):
@@ -18,10 +25,13 @@ class BuildMetadata(BaseModel):
     current_page: int
     rows_per_page: int
     total_pages: int
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+    estimated_count: bool = False
 
     @staticmethod
     def build_metadata(
-        total_count: int, params: PaginationParams
+        total_count: int, params: PaginationParams, **extra: Any
     ) -> Dict[str, Any]:
         return {
             'total_count': total_count,
@@ -29,4 +39,5 @@ class BuildMetadata(BaseModel):
             'rows_per_page': params.rows_per_page,
             'total_pages': (total_count + params.rows_per_page - 1)
             // params.rows_per_page,
+            **extra,
         }
@@ -1,9 +1,12 @@
 # app/schemas/schedule.py
 
 from datetime import datetime
+from typing import List, Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
+
+from app.schemas.pagination import PaginationParams
 
 
 class ScheduleInSchema(BaseModel):
@@ -21,7 +24,27 @@ class ScheduleInSchema(BaseModel):
 
 class ScheduleOutSchema(BaseModel):
     message_id: str = 'schedule_created_successfully'
-    schedule_id: int | None = None
+    schedule_id: UUID | None = None
+
+
+class ScheduleBulkInSchema(BaseModel):
+    items: List[ScheduleInSchema] = Field(
+        ..., min_length=1, max_length=500
+    )
+
+
+class ScheduleBulkItemOut(BaseModel):
+    # Posição do item em ``items``
+    index: int
+    status: Literal['created', 'conflict', 'invalid']
+    schedule_id: UUID | None = None
+    detail: str | None = None
+
+
+class ScheduleBulkOutSchema(BaseModel):
+    message_id: str = 'schedules_created_successfully'
+    created: int
+    results: List[ScheduleBulkItemOut]
 
 
 class UpdateScheduleInSchema(BaseModel):
@@ -51,3 +74,12 @@ class ScheduleInBlock(BaseModel):
 
 class ScheduleBlockOut(BaseModel):
     message_id: str = 'schedule_updated_successfully'
+
+
+class ScheduleListParams(PaginationParams):
+    order_by: str = 'time_register'
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    employee_id: Optional[UUID] = None
+    # Histórico em archive.schedule em vez da agenda em aberto
+    archived: bool = False
@@ -1,7 +1,8 @@
-from datetime import datetime
+from datetime import datetime, time
+from typing import Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
 
 class ScheduleInEmployee(BaseModel):
@@ -12,3 +13,35 @@ class ScheduleInEmployee(BaseModel):
 
 class ScheduleEmployeeOut(BaseModel):
     message_id: str = 'schedule_deleted_successfully'
+
+
+class WorkingHoursIn(BaseModel):
+    employee_id: UUID
+    weekday: Literal[
+        'segunda',
+        'terça',
+        'quarta',
+        'quinta',
+        'sexta',
+        'sábado',
+        'domingo',
+    ]
+    start_time: time
+    end_time: time
+    lunch_start: Optional[time] = None
+    lunch_end: Optional[time] = None
+
+    @model_validator(mode='after')
+    def check_times(self):
+        if self.end_time <= self.start_time:
+            raise ValueError('end_time must be after start_time')
+        if bool(self.lunch_start) != bool(self.lunch_end):
+            raise ValueError('lunch_start and lunch_end go together')
+        if self.lunch_start and not (
+            self.start_time
+            <= self.lunch_start
+            < self.lunch_end
+            <= self.end_time
+        ):
+            raise ValueError('lunch break must be inside the shift')
+        return self
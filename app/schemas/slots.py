@@ -1,18 +1,82 @@
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
+
+MAX_BATCH_DAYS = 31
+MAX_HORIZON_DAYS = 60
+
+
+def check_work_hours(work_start: Optional[str], work_end: Optional[str]):
+    # Sem horário informado, vale a jornada cadastrada do funcionário
+    if bool(work_start) != bool(work_end):
+        raise ValueError('work_start and work_end go together')
 
 
 class SlotsInSchema(BaseModel):
     employee_id: UUID
-    work_start: str
-    work_end: str
-    slot_minutes: int = 30
+    work_start: Optional[str] = None
+    work_end: Optional[str] = None
+    slot_minutes: int = Field(default=30, gt=0)
     target_date: Optional[date] = None
+    product_id: Optional[UUID] = None
+
+    @model_validator(mode='after')
+    def check_hours(self):
+        check_work_hours(self.work_start, self.work_end)
+        return self
 
 
 class SlotSchema(BaseModel):
     start: datetime
     end: datetime
+
+
+class SlotsBatchInSchema(BaseModel):
+    start_date: date
+    end_date: date
+    work_start: Optional[str] = None
+    work_end: Optional[str] = None
+    slot_minutes: int = Field(default=30, gt=0)
+    employee_ids: Optional[List[UUID]] = Field(default=None, min_length=1)
+    product_id: Optional[UUID] = None
+
+    @model_validator(mode='after')
+    def check_range(self):
+        check_work_hours(self.work_start, self.work_end)
+        if not self.employee_ids and not self.product_id:
+            raise ValueError('employee_ids or product_id is required')
+        if self.end_date < self.start_date:
+            raise ValueError('end_date must not be before start_date')
+        if (self.end_date - self.start_date).days >= MAX_BATCH_DAYS:
+            raise ValueError(
+                f'date range is limited to {MAX_BATCH_DAYS} days'
+            )
+        return self
+
+
+class SlotBatchSchema(BaseModel):
+    employee_id: UUID
+    date: date
+    slots: List[SlotSchema]
+
+
+class NextSlotsInSchema(BaseModel):
+    product_id: UUID
+    limit: int = Field(default=5, ge=1, le=50)
+    horizon_days: int = Field(default=14, ge=1, le=MAX_HORIZON_DAYS)
+    slot_minutes: int = Field(default=30, gt=0)
+    not_before: Optional[datetime] = None
+
+
+class NextSlotSchema(BaseModel):
+    employee_id: UUID
+    start: datetime
+    end: datetime
+
+
+class OccupancyDiffSchema(BaseModel):
+    employee_id: UUID
+    date: date
+    ranges: List[SlotSchema]
@@ -34,11 +34,8 @@ class ProductsService:
         return ProductOutSchema(message_id='product_created_successfully')
 
     async def list_products(self, pagination_params: PaginationParams):
-        products, metadata = await self.repository.list_products(
-            pagination_params
-        )
-        enriched_products = self.repository._add_images(products)
-        return enriched_products, metadata
+        # O repositório já devolve a página enriquecida com image_url
+        return await self.repository.list_products(pagination_params)
 
     async def get_product(self, id: int):
         return await self.repository.get_product(id)
@@ -6,8 +6,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.log import setup_logger
 from app.models.schedule import ScheduleService
 from app.repositories.schedule_repositories import ScheduleRepository
-from app.schemas.pagination import PaginationParams
-from app.schemas.schedule import ScheduleInSchema, ScheduleOutSchema
+from app.schemas.schedule import (
+    ScheduleBulkInSchema,
+    ScheduleBulkOutSchema,
+    ScheduleInSchema,
+    ScheduleListParams,
+    ScheduleOutSchema,
+)
 
 log = setup_logger()
 
@@ -22,7 +27,12 @@ class ScheduleService:
     ) -> ScheduleOutSchema:
         return await self.repo.add_schedule(data)
 
-    async def list_schedules(self, pagination_params: PaginationParams):
+    async def register_schedules_bulk(
+        self, data: ScheduleBulkInSchema
+    ) -> ScheduleBulkOutSchema:
+        return await self.repo.add_schedules_bulk(data.items)
+
+    async def list_schedules(self, pagination_params: ScheduleListParams):
         return await self.repo.list_schedule(pagination_params)
 
     async def get_schedule(self, id: int) -> ScheduleService | None:
@@ -1,5 +1,5 @@
 from app.repositories.service_schedule import ServiceScheduleRepository
-from app.schemas.service import ScheduleInEmployee
+from app.schemas.service import ScheduleInEmployee, WorkingHoursIn
 
 
 class ServiceSchedule:
@@ -15,3 +15,6 @@ class ServiceSchedule:
 
     async def delete_block(self, block_id: int):
         return await self.service_schedule.delete_block_schedule(block_id)
+
+    async def set_working_hours(self, data: WorkingHoursIn):
+        return await self.service_schedule.set_working_hours(data)
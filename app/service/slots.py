@@ -1,16 +1,67 @@
-from typing import List
+from datetime import datetime
+from typing import Iterator, List
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.utils.singleflight import slot_flight
+from app.repositories.products_repositories import ProductRepositories
 from app.repositories.slots_repositories import SlotsRepositories
-from app.schemas.slots import SlotSchema, SlotsInSchema
+from app.schemas.slots import (
+    NextSlotSchema,
+    NextSlotsInSchema,
+    OccupancyDiffSchema,
+    SlotBatchSchema,
+    SlotsBatchInSchema,
+    SlotSchema,
+    SlotsInSchema,
+)
 
 
 class SlotService:
     def __init__(self, session: AsyncSession):
         self.session = session
         self.slot_repo = SlotsRepositories(session)
+        self.product_repo = ProductRepositories(session)
 
     async def list_slots(self, data: SlotsInSchema) -> List[SlotSchema]:
-        slots = await self.slot_repo.list_slots(data)
+        # Pedidos iguais e simultâneos compartilham a mesma consulta
+        key = (
+            data.employee_id,
+            data.target_date or datetime.now().date(),
+            data.slot_minutes,
+            data.work_start,
+            data.work_end,
+            data.product_id,
+        )
+        slots = await slot_flight.do(
+            key, lambda: self.slot_repo.list_slots(data)
+        )
         return [SlotSchema(**s) for s in slots]
+
+    async def list_slots_batch(
+        self, data: SlotsBatchInSchema
+    ) -> Iterator[SlotBatchSchema]:
+        employee_ids = data.employee_ids
+        if not employee_ids:
+            employee_ids = (
+                await self.product_repo.list_product_employee_ids(
+                    data.product_id
+                )
+            )
+        groups = await self.slot_repo.list_slots_batch(data, employee_ids)
+        return (SlotBatchSchema(**group) for group in groups)
+
+    async def first_available(
+        self, data: NextSlotsInSchema
+    ) -> List[NextSlotSchema]:
+        employee_ids = await self.product_repo.list_product_employee_ids(
+            data.product_id
+        )
+        if not employee_ids:
+            return []
+        slots = await self.slot_repo.first_available(data, employee_ids)
+        return [NextSlotSchema(**s) for s in slots]
+
+    async def check_occupancy(self) -> List[OccupancyDiffSchema]:
+        diffs = await self.slot_repo.check_occupancy()
+        return [OccupancyDiffSchema(**d) for d in diffs]
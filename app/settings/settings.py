@@ -1,4 +1,6 @@
 # app/settings/settings.py
+from typing import Dict, Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -13,6 +15,49 @@ class Settings(BaseSettings):
     backend_base_url: str
     cors_origins: str
 
+    # Pool por worker: 4 workers x (pool + overflow) abaixo do
+    # max_connections=200 do Postgres, com folga para migrações e psql
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 1800
+    # Espera por conexão acima disso gera warning no log
+    db_pool_wait_warning_ms: float = 100.0
+    # Total e página da listagem em conexões paralelas só com pelo
+    # menos essa folga no pool; abaixo disso, em sequência
+    db_concurrent_min_headroom: int = 4
+    # SQL compilado (por processo) e prepared statements do asyncpg
+    # (por conexão): cada combinação de filtro, ordenação e modo de
+    # paginação das listagens é uma entrada
+    db_query_cache_size: int = 1200
+    db_prepared_statement_cache_size: int = 500
+
+    # Réplica de leitura opcional para listagens, consultas e slots
+    sqlalchemy_replica_uri: Optional[str] = None
+    replica_max_lag_seconds: float = 5.0
+    replica_check_seconds: float = 5.0
+    # Após uma escrita o cliente lê do primário; manter acima do atraso
+    # máximo tolerado
+    replica_pin_seconds: int = 10
+
+    # Partições mensais de service.schedule criadas à frente do mês atual
+    schedule_partitions_ahead: int = 3
+
+    # Dias após a exclusão (ou o atendimento, em schedule) antes de
+    # mover a linha para o schema archive; tabela ausente não arquiva
+    archive_retention_days: Dict[str, int] = {
+        'schedule': 180,
+        'block': 90,
+        'schedule_employee': 180,
+        'products_employees': 180,
+        'products': 365,
+        'employees': 365,
+        'user': 365,
+    }
+    archive_batch_size: int = 500
+    archive_interval_seconds: int = 3600
+
     class Config:
         env_file = '.env'
 
@@ -0,0 +1,69 @@
+"""busca por trigramas
+
+Revision ID: 14dfa1469caa
+Revises: ec25e1cb199f
+Create Date: 2026-10-18 14:21:37.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '14dfa1469caa'
+down_revision: Union[str, Sequence[str], None] = 'ec25e1cb199f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nome, tabela, schema, coluna)
+INDEXES = [
+    ('ix_user_username_trgm', 'user', 'public', 'username'),
+    ('ix_employees_username_trgm', 'employees', 'employee', 'username'),
+    (
+        'ix_products_description_trgm',
+        'products',
+        'finance',
+        'description',
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # unaccent() é STABLE; índices de expressão exigem IMMUTABLE
+    op.execute(
+        'CREATE OR REPLACE FUNCTION public.immutable_unaccent(text) '
+        'RETURNS text LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS '
+        "$$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$"
+    )
+
+    with op.get_context().autocommit_block():
+        for name, table, schema, column in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [sa.text(f'public.immutable_unaccent({column}) gin_trgm_ops')],
+                schema=schema,
+                postgresql_using='gin',
+                postgresql_where=sa.text('is_deleted = false'),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, schema, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                schema=schema,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    op.execute('DROP FUNCTION IF EXISTS public.immutable_unaccent(text)')
@@ -0,0 +1,48 @@
+"""indice da agenda
+
+Revision ID: 28c6984af449
+Revises: 14dfa1469caa
+Create Date: 2026-10-18 15:02:48.317564
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '28c6984af449'
+down_revision: Union[str, Sequence[str], None] = '14dfa1469caa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A agenda por funcionário usa ix_schedule_employee_id_time_register
+    # (ec25e1cb199f); este cobre a agenda do dia de todos os funcionários
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_schedule_open_time_register',
+            'schedule',
+            ['time_register'],
+            schema='service',
+            postgresql_where=sa.text(
+                'is_deleted = false AND is_check = false'
+            ),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_schedule_open_time_register',
+            table_name='schedule',
+            schema='service',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
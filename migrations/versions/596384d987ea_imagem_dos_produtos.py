@@ -0,0 +1,32 @@
+"""imagem dos produtos
+
+Revision ID: 596384d987ea
+Revises: e8b970253f8c
+Create Date: 2026-10-18 09:12:40.215377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '596384d987ea'
+down_revision: Union[str, Sequence[str], None] = 'e8b970253f8c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'products',
+        sa.Column('image_path', sa.String(length=255), nullable=True),
+        schema='finance',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('products', 'image_path', schema='finance')
@@ -0,0 +1,114 @@
+"""impede agendamentos sobrepostos
+
+Revision ID: 82bdc7fe8ace
+Revises: a797741054e0
+Create Date: 2026-10-18 17:02:11.438120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '82bdc7fe8ace'
+down_revision: Union[str, Sequence[str], None] = 'a797741054e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mesmo texto de app.db.partitions.OVERLAP_CONSTRAINT
+OVERLAP_CONSTRAINT = (
+    'ALTER TABLE service.%I ADD CONSTRAINT %I '
+    'EXCLUDE USING gist (employee_id WITH =, '
+    'tsrange(time_register, end_time) WITH &&) '
+    'WHERE (is_deleted = false)'
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+
+    # Fim do atendimento gravado na linha: a constraint não pode
+    # consultar finance.products
+    op.execute('ALTER TABLE service.schedule ADD COLUMN end_time timestamp')
+    op.execute('ALTER TABLE archive.schedule ADD COLUMN end_time timestamp')
+    for table in ('service.schedule', 'archive.schedule'):
+        op.execute(
+            f'UPDATE {table} s SET end_time = '
+            's.time_register + p.time_to_spend '
+            'FROM finance.products p WHERE p.id = s.product_id'
+        )
+    op.execute(
+        'ALTER TABLE service.schedule ALTER COLUMN end_time SET NOT NULL'
+    )
+    op.execute("""
+        CREATE FUNCTION service.schedule_set_end_time() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.end_time := NEW.time_register + (
+                SELECT time_to_spend FROM finance.products
+                 WHERE id = NEW.product_id
+            );
+            RETURN NEW;
+        END
+        $$
+    """)
+    op.execute(
+        'CREATE TRIGGER schedule_set_end_time '
+        'BEFORE INSERT OR UPDATE OF time_register, product_id '
+        'ON service.schedule FOR EACH ROW '
+        'EXECUTE FUNCTION service.schedule_set_end_time()'
+    )
+
+    # Exclusão por partição: na tabela particionada a constraint teria
+    # de incluir time_register com igualdade, o que não serve. Falha
+    # (apontando as linhas) se já houver sobreposições em aberto.
+    op.execute(f"""
+        DO $$
+        DECLARE
+            part text;
+        BEGIN
+            FOR part IN
+                SELECT child.relname FROM pg_inherits i
+                  JOIN pg_class child ON child.oid = i.inhrelid
+                 WHERE i.inhparent = 'service.schedule'::regclass
+            LOOP
+                EXECUTE format(
+                    '{OVERLAP_CONSTRAINT}',
+                    part,
+                    part || '_no_overlap'
+                );
+            END LOOP;
+        END
+        $$
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+        DO $$
+        DECLARE
+            part text;
+        BEGIN
+            FOR part IN
+                SELECT child.relname FROM pg_inherits i
+                  JOIN pg_class child ON child.oid = i.inhrelid
+                 WHERE i.inhparent = 'service.schedule'::regclass
+            LOOP
+                EXECUTE format(
+                    'ALTER TABLE service.%I DROP CONSTRAINT IF EXISTS %I',
+                    part,
+                    part || '_no_overlap'
+                );
+            END LOOP;
+        END
+        $$
+    """)
+    op.execute(
+        'DROP TRIGGER IF EXISTS schedule_set_end_time ON service.schedule'
+    )
+    op.execute('DROP FUNCTION IF EXISTS service.schedule_set_end_time()')
+    op.execute('ALTER TABLE archive.schedule DROP COLUMN end_time')
+    op.execute('ALTER TABLE service.schedule DROP COLUMN end_time')
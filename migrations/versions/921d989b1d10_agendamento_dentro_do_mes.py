@@ -0,0 +1,42 @@
+"""agendamento dentro do mês
+
+Revision ID: 921d989b1d10
+Revises: bd269a52d25c
+Create Date: 2026-10-18 21:03:52.640918
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '921d989b1d10'
+down_revision: Union[str, Sequence[str], None] = 'bd269a52d25c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mesmo nome de app.repositories.schedule_repositories
+SINGLE_MONTH_CONSTRAINT = 'ck_schedule_single_month'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A exclusão contra sobreposição vale por partição (82bdc7fe8ace):
+    # um atendimento que atravessa a virada do mês escaparia dela.
+    # No pai, o CHECK vale para todas as partições, atuais e futuras.
+    op.execute(
+        'ALTER TABLE service.schedule '
+        f'ADD CONSTRAINT {SINGLE_MONTH_CONSTRAINT} CHECK ('
+        "date_trunc('month', time_register) = "
+        "date_trunc('month', end_time - interval '1 microsecond'))"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        'ALTER TABLE service.schedule '
+        f'DROP CONSTRAINT IF EXISTS {SINGLE_MONTH_CONSTRAINT}'
+    )
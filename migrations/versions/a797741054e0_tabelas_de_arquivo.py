@@ -0,0 +1,57 @@
+"""tabelas de arquivo
+
+Revision ID: a797741054e0
+Revises: d152f8d106a6
+Create Date: 2026-10-18 16:21:37.905418
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a797741054e0'
+down_revision: Union[str, Sequence[str], None] = 'd152f8d106a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mesmas tabelas de app.db.archive.POLICIES
+TABLES = [
+    ('service', 'schedule'),
+    ('service', 'block'),
+    ('time_recording', 'schedule_employee'),
+    ('finance', 'products_employees'),
+    ('finance', 'products'),
+    ('employee', 'employees'),
+    ('public', 'user'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE SCHEMA IF NOT EXISTS archive')
+    for schema, name in TABLES:
+        # Sem PK, FKs nem índices da origem: só recebe inserções
+        op.execute(
+            f'CREATE TABLE archive."{name}" '
+            f'(LIKE {schema}."{name}" INCLUDING DEFAULTS)'
+        )
+        op.execute(
+            f'ALTER TABLE archive."{name}" '
+            'ADD COLUMN archived_at timestamp NOT NULL DEFAULT now()'
+        )
+        op.execute(f'CREATE INDEX ON archive."{name}" (id)')
+    # Histórico da agenda: GET /schedule?archived=true
+    op.execute(
+        'CREATE INDEX ix_archive_schedule_employee_id_time_register '
+        'ON archive.schedule (employee_id, time_register)'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # O schema fica: também guarda as partições desanexadas
+    for _, name in TABLES:
+        op.execute(f'DROP TABLE IF EXISTS archive."{name}"')
@@ -0,0 +1,46 @@
+"""data de exclusão dos registros
+
+Revision ID: bd269a52d25c
+Revises: eeea5ca394be
+Create Date: 2026-10-18 20:41:07.902114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bd269a52d25c'
+down_revision: Union[str, Sequence[str], None] = 'eeea5ca394be'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tabelas com soft delete arquivadas por app.db.archive
+TABLES = (
+    'service.schedule',
+    'service.block',
+    'time_recording.schedule_employee',
+    'finance.products_employees',
+    'finance.products',
+    'employee.employees',
+    'public."user"',
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Os deletes não gravavam deleted_at e o arquivador agora conta a
+    # retenção só por ele: exclusões antigas começam a contar agora
+    for table in TABLES:
+        op.execute(
+            f'UPDATE {table} SET deleted_at = now() '
+            'WHERE is_deleted AND deleted_at IS NULL'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Sem volta: não há como distinguir as datas preenchidas aqui
+    pass
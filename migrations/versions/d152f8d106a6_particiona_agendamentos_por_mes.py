@@ -0,0 +1,113 @@
+"""particiona agendamentos por mes
+
+Revision ID: d152f8d106a6
+Revises: 28c6984af449
+Create Date: 2026-10-18 15:48:03.664207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd152f8d106a6'
+down_revision: Union[str, Sequence[str], None] = '28c6984af449'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mesmo horizonte de app.db.partitions.PARTITIONS_AHEAD
+PARTITIONS_AHEAD = 3
+
+CONSTRAINTS = [
+    'ALTER TABLE service.schedule ADD CONSTRAINT '
+    'fk_schedule_employee_id_employees FOREIGN KEY (employee_id) '
+    'REFERENCES employee.employees (id)',
+    'ALTER TABLE service.schedule ADD CONSTRAINT '
+    'fk_schedule_product_id_products FOREIGN KEY (product_id) '
+    'REFERENCES finance.products (id)',
+]
+
+INDEXES = [
+    'CREATE INDEX ix_schedule_employee_id_time_register '
+    'ON service.schedule (employee_id, time_register) '
+    'WHERE is_deleted = false',
+    'CREATE INDEX ix_schedule_user_id_is_check '
+    'ON service.schedule (user_id, is_check) WHERE is_deleted = false',
+    'CREATE INDEX ix_schedule_open_time_register '
+    'ON service.schedule (time_register) '
+    'WHERE is_deleted = false AND is_check = false',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('ALTER TABLE service.schedule RENAME TO schedule_legacy')
+    op.execute(
+        'CREATE TABLE service.schedule '
+        '(LIKE service.schedule_legacy INCLUDING DEFAULTS) '
+        'PARTITION BY RANGE (time_register)'
+    )
+    op.execute(
+        'CREATE TABLE service.schedule_default '
+        'PARTITION OF service.schedule DEFAULT'
+    )
+    # Um mês por partição, do primeiro agendamento até o horizonte
+    op.execute(f"""
+        DO $$
+        DECLARE
+            part_month date;
+            last_month date;
+        BEGIN
+            SELECT date_trunc('month', coalesce(min(time_register), now()))
+              INTO part_month
+              FROM service.schedule_legacy;
+            last_month := date_trunc('month', now())
+                + interval '{PARTITIONS_AHEAD} months';
+            WHILE part_month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE service.%I PARTITION OF service.schedule '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    'schedule_y' || to_char(part_month, 'YYYY')
+                        || 'm' || to_char(part_month, 'MM'),
+                    part_month,
+                    part_month + interval '1 month'
+                );
+                part_month := part_month + interval '1 month';
+            END LOOP;
+        END
+        $$
+    """)
+    op.execute(
+        'INSERT INTO service.schedule SELECT * FROM service.schedule_legacy'
+    )
+    op.execute('DROP TABLE service.schedule_legacy')
+
+    # A chave de partição precisa fazer parte da PK
+    op.execute(
+        'ALTER TABLE service.schedule ADD CONSTRAINT pk_schedule '
+        'PRIMARY KEY (id, time_register)'
+    )
+    for statement in CONSTRAINTS + INDEXES:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Partições já movidas para o schema archive não voltam
+    op.execute('ALTER TABLE service.schedule RENAME TO schedule_partitioned')
+    op.execute(
+        'CREATE TABLE service.schedule '
+        '(LIKE service.schedule_partitioned INCLUDING DEFAULTS)'
+    )
+    op.execute(
+        'INSERT INTO service.schedule '
+        'SELECT * FROM service.schedule_partitioned'
+    )
+    op.execute('DROP TABLE service.schedule_partitioned CASCADE')
+    op.execute(
+        'ALTER TABLE service.schedule ADD CONSTRAINT pk_schedule '
+        'PRIMARY KEY (id)'
+    )
+    for statement in CONSTRAINTS + INDEXES:
+        op.execute(statement)
@@ -0,0 +1,98 @@
+"""indices parciais e compostos
+
+Revision ID: ec25e1cb199f
+Revises: 596384d987ea
+Create Date: 2026-10-18 13:05:12.481930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ec25e1cb199f'
+down_revision: Union[str, Sequence[str], None] = '596384d987ea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NOT_DELETED = sa.text('is_deleted = false')
+
+# (nome, tabela, schema, colunas)
+INDEXES = [
+    (
+        'ix_schedule_employee_id_time_register',
+        'schedule',
+        'service',
+        ['employee_id', 'time_register'],
+    ),
+    (
+        'ix_schedule_user_id_is_check',
+        'schedule',
+        'service',
+        ['user_id', 'is_check'],
+    ),
+    (
+        'ix_block_employee_id_start_time',
+        'block',
+        'service',
+        ['employee_id', 'start_time'],
+    ),
+    ('ix_user_phone', 'user', 'public', ['phone']),
+    ('ix_employees_phone', 'employees', 'employee', ['phone']),
+    (
+        'ix_products_employees_employee_id',
+        'products_employees',
+        'finance',
+        ['employee_id'],
+    ),
+    (
+        'ix_products_employees_product_id',
+        'products_employees',
+        'finance',
+        ['product_id'],
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Colunas usadas pelo repositório mas ausentes da tabela original
+    op.execute(
+        'ALTER TABLE service.schedule '
+        'ADD COLUMN IF NOT EXISTS is_check BOOLEAN NOT NULL DEFAULT false'
+    )
+    op.execute(
+        'ALTER TABLE service.schedule '
+        'ADD COLUMN IF NOT EXISTS is_awayalone BOOLEAN NOT NULL '
+        'DEFAULT false'
+    )
+
+    # CONCURRENTLY não roda dentro de transação
+    with op.get_context().autocommit_block():
+        for name, table, schema, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                schema=schema,
+                postgresql_where=NOT_DELETED,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, schema, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                schema=schema,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    op.drop_column('schedule', 'is_awayalone', schema='service')
+    op.drop_column('schedule', 'is_check', schema='service')
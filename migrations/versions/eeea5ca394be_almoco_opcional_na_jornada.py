@@ -0,0 +1,48 @@
+"""almoço opcional na jornada
+
+Revision ID: eeea5ca394be
+Revises: 82bdc7fe8ace
+Create Date: 2026-10-18 19:12:40.217533
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'eeea5ca394be'
+down_revision: Union[str, Sequence[str], None] = '82bdc7fe8ace'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Espelho em archive criado com LIKE: herdou o NOT NULL
+TABLES = ('time_recording.schedule_employee', 'archive.schedule_employee')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Jornada sem intervalo: POST /service/working-hours sem almoço
+    for table in TABLES:
+        op.execute(
+            f'ALTER TABLE {table} '
+            'ALTER COLUMN lunch_start DROP NOT NULL, '
+            'ALTER COLUMN lunch_end DROP NOT NULL'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Sem almoço vira um intervalo vazio no início do turno
+    for table in TABLES:
+        op.execute(
+            f'UPDATE {table} SET lunch_start = start_time, '
+            'lunch_end = start_time '
+            'WHERE lunch_start IS NULL OR lunch_end IS NULL'
+        )
+        op.execute(
+            f'ALTER TABLE {table} '
+            'ALTER COLUMN lunch_start SET NOT NULL, '
+            'ALTER COLUMN lunch_end SET NOT NULL'
+        )
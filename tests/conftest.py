@@ -0,0 +1,16 @@
+# tests/conftest.py
+import os
+
+# Testes de unidade: só as variáveis obrigatórias de Settings, sem banco.
+# O engine é criado no import, mas só conecta no primeiro uso.
+for name, value in {
+    'SQLALCHEMY_DATABASE_URI': 'postgresql+asyncpg://u:p@localhost/test',
+    'SECRET_KEY': 'test',
+    'ALGORITHM': 'HS256',
+    'ACCESS_TOKEN_EXPIRE_MINUTES': '30',
+    'URL_FRONTEND': 'http://localhost:3000',
+    'URL_VITE_FRONTEND': 'http://localhost:5173',
+    'BACKEND_BASE_URL': 'http://localhost:8000',
+    'CORS_ORIGINS': '*',
+}.items():
+    os.environ.setdefault(name, value)
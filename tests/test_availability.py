@@ -0,0 +1,114 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from app.core.utils.availability import AvailabilityEngine, IntervalIndex
+
+DAY = datetime(2026, 10, 19)
+APPOINTMENTS = 12_000
+BLOCKS = 300
+
+
+def at(hour: int, minute: int = 0) -> datetime:
+    return DAY.replace(hour=hour, minute=minute)
+
+
+def naive_free_slots(busy, window_start, window_end, slot_minutes, length):
+    """Referência O(slots x intervalos)."""
+    step = timedelta(minutes=slot_minutes)
+    length = length or step
+    available = []
+    current = window_start
+    while current + length <= window_end:
+        end = current + length
+        if not any(s < end and current < e for s, e in busy):
+            available.append({'start': current, 'end': end})
+        current += step
+    return available
+
+
+def history(seed: int = 7):
+    """Agendamentos de ~3 anos e bloqueios espalhados, em 5 minutos."""
+    rng = random.Random(seed)
+    first_day = DAY - timedelta(days=3 * 365)
+    busy = []
+    for _ in range(APPOINTMENTS):
+        day = first_day + timedelta(days=rng.randrange(3 * 365 + 30))
+        start = day + timedelta(minutes=5 * rng.randrange(96, 228))
+        busy.append((
+            start,
+            start + timedelta(minutes=rng.choice([30, 45])),
+        ))
+    for _ in range(BLOCKS):
+        day = first_day + timedelta(days=rng.randrange(3 * 365 + 30))
+        start = day + timedelta(minutes=5 * rng.randrange(96, 216))
+        busy.append((start, start + timedelta(hours=rng.choice([1, 2]))))
+    return busy
+
+
+def test_index_merges_overlapping_and_touching_intervals():
+    index = IntervalIndex([
+        (at(10), at(11)),
+        (at(9), at(10)),
+        (at(10, 30), at(12)),
+        (at(14), at(14)),
+    ])
+
+    assert list(index) == [(at(9), at(12))]
+
+
+def test_overlaps_is_half_open():
+    index = IntervalIndex([(at(10), at(11))])
+
+    assert index.overlaps(at(10, 30), at(10, 45))
+    assert index.overlaps(at(9, 30), at(10, 5))
+    assert not index.overlaps(at(9), at(10))
+    assert not index.overlaps(at(11), at(12))
+
+
+def test_free_slots_skips_busy_intervals():
+    engine = AvailabilityEngine([(at(9, 10), at(9, 40))])
+
+    slots = engine.free_slots(at(9), at(10, 30), 30, timedelta(minutes=30))
+
+    assert [slot['start'] for slot in slots] == [at(10)]
+
+
+def test_free_slots_matches_reference():
+    busy = history()
+    engine = AvailabilityEngine(busy)
+    for day in range(0, 30, 3):
+        start = at(8) - timedelta(days=day)
+        end = start + timedelta(hours=12)
+        for slot_minutes, length in ((15, None), (30, timedelta(hours=1))):
+            assert engine.free_slots(
+                start, end, slot_minutes, length
+            ) == naive_free_slots(busy, start, end, slot_minutes, length)
+
+
+def test_free_slots_benchmark_with_long_history():
+    """Benchmark: 12k agendamentos e 300 bloqueios, 30 dias de slots."""
+    busy = history()
+    windows = [
+        (at(8) - timedelta(days=day), at(20) - timedelta(days=day))
+        for day in range(30)
+    ]
+
+    started = time.perf_counter()
+    engine = AvailabilityEngine(busy)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    indexed = [engine.free_slots(s, e, 15, None) for s, e in windows]
+    indexed_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    naive = [naive_free_slots(busy, s, e, 15, None) for s, e in windows]
+    naive_ms = (time.perf_counter() - started) * 1000
+
+    print(
+        f'\n{len(busy)} intervals: build {build_ms:.1f} ms, '
+        f'indexed {indexed_ms:.2f} ms, naive {naive_ms:.1f} ms'
+    )
+    assert indexed == naive
+    assert indexed_ms * 10 < naive_ms
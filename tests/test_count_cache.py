@@ -0,0 +1,45 @@
+from app.core.utils.count_cache import CountCache
+
+FILTERS = ('corte', 'contains', None)
+
+
+def test_hit_after_put():
+    cache = CountCache()
+
+    assert cache.get('products', FILTERS) is None
+    cache.put('products', FILTERS, 42)
+
+    assert cache.get('products', FILTERS) == 42
+    assert cache.stats() == {
+        'hits': 1,
+        'misses': 1,
+        'hit_ratio': 0.5,
+        'entries': 1,
+    }
+
+
+def test_filters_are_part_of_the_key():
+    cache = CountCache()
+    cache.put('products', FILTERS, 42)
+
+    assert cache.get('products', ('barba', 'contains', None)) is None
+    assert cache.get('users', FILTERS) is None
+
+
+def test_invalidate_only_the_entity():
+    cache = CountCache()
+    cache.put('products', FILTERS, 42)
+    cache.put('users', FILTERS, 7)
+
+    cache.invalidate('products')
+
+    assert cache.get('products', FILTERS) is None
+    assert cache.get('users', FILTERS) == 7
+
+
+def test_entries_expire():
+    cache = CountCache(ttl_seconds=0)
+    cache.put('products', FILTERS, 42)
+
+    assert cache.get('products', FILTERS) is None
+    assert cache.stats()['entries'] == 0
@@ -0,0 +1,113 @@
+import os
+import statistics
+import time
+
+from app.core.utils.image_manifest import ImageManifest
+from app.repositories import products_repositories
+from app.repositories.products_repositories import (
+    ProductRepositories,
+    reset_enrichment_passes,
+)
+
+LARGE_TREE = 2000
+
+
+def make_upload(root, day: str, description: str, filename: str) -> None:
+    folder = os.path.join(
+        root, *day.split('/'), f'product_images_{description}'
+    )
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, filename), 'wb') as file:
+        file.write(b'\xff')
+
+
+def make_tree(root, products: int) -> None:
+    for n in range(products):
+        day = f'{2020 + n % 5}/{n % 12 + 1:02d}/{n % 28 + 1:02d}'
+        make_upload(root, day, f'produto-{n}', 'a.jpg')
+
+
+def test_build_maps_description_to_image(tmp_path):
+    make_upload(tmp_path, '2024/01/10', 'corte', 'b.png')
+    make_upload(tmp_path, '2024/01/10', 'barba', 'notes.txt')
+
+    manifest = ImageManifest(str(tmp_path))
+
+    assert manifest.build() == 1
+    assert manifest.get('corte') == (
+        'static/uploads/2024/01/10/product_images_corte/b.png'
+    )
+    assert manifest.get('barba') is None
+
+
+def test_latest_upload_wins(tmp_path):
+    make_upload(tmp_path, '2023/12/31', 'corte', 'old.jpg')
+    make_upload(tmp_path, '2024/02/01', 'corte', 'new.jpg')
+
+    manifest = ImageManifest(str(tmp_path))
+    manifest.build()
+
+    assert manifest.get('corte').endswith(
+        '2024/02/01/product_images_corte/new.jpg'
+    )
+
+
+def test_register_is_seen_by_other_workers(tmp_path):
+    first = ImageManifest(str(tmp_path))
+    second = ImageManifest(str(tmp_path))
+    first.build()
+    second.load()
+
+    # mtime em ns pode coincidir no mesmo tick; força a diferença
+    time.sleep(0.01)
+    first.register('corte', 'static/uploads/2024/01/10/x.jpg')
+    second.refresh()
+
+    assert second.get('corte') == 'static/uploads/2024/01/10/x.jpg'
+
+
+def test_load_builds_missing_manifest(tmp_path):
+    make_upload(tmp_path, '2024/01/10', 'corte', 'a.jpg')
+
+    manifest = ImageManifest(str(tmp_path))
+
+    assert manifest.load() == 1
+    assert os.path.exists(manifest.manifest_file)
+
+
+def list_page_ms(manifest, monkeypatch, page) -> float:
+    """Mediana (ms) do enriquecimento de uma página de produtos."""
+    monkeypatch.setattr(products_repositories, 'image_manifest', manifest)
+    repository = ProductRepositories(session=None)
+    samples = []
+    for _ in range(50):
+        reset_enrichment_passes()
+        started = time.perf_counter()
+        repository._add_images(page)
+        samples.append((time.perf_counter() - started) * 1000)
+    reset_enrichment_passes()
+    return statistics.median(samples)
+
+
+def test_list_latency_flat_as_upload_tree_grows(tmp_path, monkeypatch):
+    """Benchmark: o custo por página não depende do tamanho da árvore."""
+    small_root = tmp_path / 'small'
+    large_root = tmp_path / 'large'
+    make_tree(small_root, 10)
+    make_tree(large_root, LARGE_TREE)
+    small = ImageManifest(str(small_root))
+    large = ImageManifest(str(large_root))
+    small.build()
+    large.build()
+
+    # Produtos sem image_path: todos caem no manifesto
+    page = [{'description': f'produto-{n}'} for n in range(10)]
+    small_ms = list_page_ms(small, monkeypatch, page)
+    large_ms = list_page_ms(large, monkeypatch, page)
+    print(
+        f'\n_add_images, 10 products: {small_ms:.3f} ms (10 folders), '
+        f'{large_ms:.3f} ms ({LARGE_TREE} folders)'
+    )
+
+    # O os.walk por produto crescia com a árvore; folga para ruído
+    assert large_ms < small_ms * 5 + 1
@@ -0,0 +1,84 @@
+import asyncio
+
+from app.db.session import LazySession
+
+
+class StubSession:
+    """Só o que o LazySession consulta."""
+
+    def __init__(self, in_transaction=True, new=()):
+        self._in_transaction = in_transaction
+        self.new = set(new)
+        self.dirty = set()
+        self.deleted = set()
+        self.commits = 0
+        self.closed = False
+        self.info = {}
+
+    def in_transaction(self):
+        return self._in_transaction
+
+    async def commit(self):
+        self.commits += 1
+        self._in_transaction = False
+
+    async def close(self):
+        self.closed = True
+
+
+class CountingFactory:
+    def __init__(self, **session_kwargs):
+        self.session_kwargs = session_kwargs
+        self.sessions = []
+
+    def __call__(self):
+        self.sessions.append(StubSession(**self.session_kwargs))
+        return self.sessions[-1]
+
+
+def test_session_is_created_on_first_use_only():
+    factory = CountingFactory()
+    lazy = LazySession(factory)
+
+    asyncio.run(lazy.release())
+    asyncio.run(lazy.close())
+    assert factory.sessions == []
+
+    assert lazy.info == {}
+    assert lazy.info is lazy.info
+    assert len(factory.sessions) == 1
+
+
+def test_release_commits_a_clean_read_transaction():
+    factory = CountingFactory()
+    lazy = LazySession(factory)
+    assert lazy.in_transaction()
+
+    asyncio.run(lazy.release())
+    asyncio.run(lazy.release())
+
+    (session,) = factory.sessions
+    assert session.commits == 1
+
+
+def test_release_keeps_pending_writes():
+    factory = CountingFactory(new=[object()])
+    lazy = LazySession(factory)
+    assert lazy.in_transaction()
+
+    asyncio.run(lazy.release())
+
+    assert factory.sessions[0].commits == 0
+
+
+def test_release_without_transaction_does_nothing():
+    factory = CountingFactory(in_transaction=False)
+    lazy = LazySession(factory)
+    assert not lazy.in_transaction()
+
+    asyncio.run(lazy.release())
+    asyncio.run(lazy.close())
+
+    (session,) = factory.sessions
+    assert session.commits == 0
+    assert session.closed
@@ -0,0 +1,189 @@
+import asyncio
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+from app.core.utils.availability import AvailabilityEngine
+from app.core.utils.occupancy import (
+    BITS_PER_DAY,
+    OccupancyStore,
+    diff_ranges,
+    free_slots,
+    mask_from_intervals,
+    occupancy_store,
+    range_mask,
+)
+from app.repositories.slots_repositories import SlotsRepositories
+
+DAY = date(2026, 10, 19)
+
+
+def at(hour: int, minute: int = 0, day: date = DAY) -> datetime:
+    return datetime.combine(day, datetime.min.time()).replace(
+        hour=hour, minute=minute
+    )
+
+
+def test_range_mask_rounds_outwards():
+    # 09:03-09:07 toca os blocos 09:00 e 09:05
+    assert range_mask(DAY, at(9, 3), at(9, 7)) == 0b11 << 108
+
+
+def test_range_mask_clips_to_the_day():
+    previous_day = DAY - timedelta(days=1)
+    overnight = (at(23, 0, previous_day), at(1))
+
+    assert range_mask(DAY, *overnight) == (1 << 12) - 1
+    assert range_mask(DAY, at(23, 0, previous_day), at(0)) == 0
+    assert range_mask(DAY, at(23), at(2, day=DAY + timedelta(days=1))) == (
+        ((1 << 12) - 1) << (BITS_PER_DAY - 12)
+    )
+
+
+def test_free_slots_matches_availability_engine():
+    busy = [(at(9, 10), at(9, 40)), (at(13), at(14, 30))]
+    mask = mask_from_intervals(DAY, busy)
+    length = timedelta(minutes=45)
+
+    assert free_slots(
+        mask, DAY, at(8), at(18), 15, length
+    ) == AvailabilityEngine(busy).free_slots(at(8), at(18), 15, length)
+
+
+def test_diff_ranges_reports_changed_stretches():
+    expected = mask_from_intervals(DAY, [(at(9), at(10))])
+    cached = mask_from_intervals(DAY, [(at(9), at(9, 30))])
+
+    assert diff_ranges(DAY, expected, cached) == [(at(9, 30), at(10))]
+
+
+def test_store_occupy_and_release():
+    store = OccupancyStore()
+    employee_id = uuid4()
+    store.put(employee_id, DAY, 0)
+
+    store.occupy(employee_id, at(9), at(9, 30))
+    assert store.get(employee_id, DAY) == range_mask(DAY, at(9), at(9, 30))
+
+    store.release(employee_id, at(9), at(9, 30))
+    assert store.get(employee_id, DAY) is None
+
+
+def test_store_expires_entries():
+    store = OccupancyStore(ttl_seconds=0)
+    employee_id = uuid4()
+    store.put(employee_id, DAY, 1)
+
+    assert store.get(employee_id, DAY) is None
+
+
+class InMemorySlots(SlotsRepositories):
+    """Ocupação de uma lista fixa; conta as consultas."""
+
+    def __init__(self, rows):
+        super().__init__(session=None)
+        self.rows = rows
+        self.queries = 0
+
+    async def list_busy_intervals(self, employee_ids, start_dt, end_dt):
+        self.queries += 1
+        busy = defaultdict(list)
+        for employee_id, start, end in self.rows:
+            if employee_id in employee_ids and start < end_dt:
+                if end > start_dt:
+                    busy[employee_id].append((start, end))
+        return busy
+
+
+def test_check_occupancy_rebuilds_all_days_with_one_query():
+    employees = [uuid4() for _ in range(3)]
+    days = [DAY + timedelta(days=n) for n in range(5)]
+    rows = [
+        (employee_id, at(9, day=day), at(9, 45, day=day))
+        for employee_id in employees
+        for day in days
+    ]
+    # Atravessa a meia-noite: ocupa o fim de um dia e o começo do outro
+    rows.append((employees[0], at(23, day=days[1]), at(1, day=days[2])))
+    repository = InMemorySlots(rows)
+
+    occupancy_store.invalidate()
+    for employee_id in employees:
+        for day in days:
+            occupancy_store.put(employee_id, day, 0)
+    try:
+        report = asyncio.run(repository.check_occupancy())
+
+        assert repository.queries == 1
+        assert len(report) == len(employees) * len(days)
+        for employee_id in employees:
+            for day in days:
+                expected = asyncio.run(
+                    InMemorySlots(rows)._load_occupancy(employee_id, day)
+                )
+                assert occupancy_store.get(employee_id, day) == expected
+        assert asyncio.run(repository.check_occupancy()) == []
+    finally:
+        occupancy_store.invalidate()
+
+
+def test_store_rejects_a_load_older_than_a_write():
+    store = OccupancyStore()
+    employee_id = uuid4()
+
+    version = store.version(employee_id, DAY)
+    store.occupy(employee_id, at(9), at(9, 30))
+
+    assert not store.put(employee_id, DAY, 0, version)
+    assert store.get(employee_id, DAY) is None
+    assert store.put(employee_id, DAY, 0, store.version(employee_id, DAY))
+
+
+def test_invalidate_rejects_loads_in_flight():
+    store = OccupancyStore()
+    employee_id = uuid4()
+
+    version = store.version(employee_id, DAY)
+    store.invalidate(employee_id)
+
+    assert not store.put(employee_id, DAY, 0, version)
+
+
+class SlowSlots(InMemorySlots):
+    """Segura a consulta até o teste liberar."""
+
+    def __init__(self, rows):
+        super().__init__(rows)
+        self.loading = asyncio.Event()
+        self.resume = asyncio.Event()
+
+    async def list_busy_intervals(self, employee_ids, start_dt, end_dt):
+        busy = await super().list_busy_intervals(
+            employee_ids, start_dt, end_dt
+        )
+        self.loading.set()
+        await self.resume.wait()
+        return busy
+
+
+def test_booking_during_a_read_is_not_lost():
+    employee_id = uuid4()
+
+    async def main():
+        repository = SlowSlots([])
+        read = asyncio.create_task(
+            repository.get_occupancy(employee_id, DAY)
+        )
+        await repository.loading.wait()
+        # Reserva confirmada enquanto a leitura ainda consultava
+        occupancy_store.occupy(employee_id, at(9), at(9, 30))
+        repository.resume.set()
+        return await read
+
+    occupancy_store.invalidate()
+    try:
+        assert asyncio.run(main()) == 0
+        # O bitmap anterior à reserva não ficou no cache
+        assert occupancy_store.get(employee_id, DAY) is None
+    finally:
+        occupancy_store.invalidate()
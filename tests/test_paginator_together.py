@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from app.core.utils import paginator as paginator_module
+from app.core.utils.paginator import Paginator
+from app.core.utils.pool_metrics import PoolMetrics
+from app.db.replica import ReplicaMonitor
+from app.schemas.pagination import PaginationParams
+
+
+class StubPool:
+    def __init__(self, free):
+        self.free = free
+
+    def size(self):
+        return self.free
+
+    def checkedout(self):
+        return 0
+
+
+class StubSession:
+    """Sessão de mentira: só ``info`` e o ``async with``."""
+
+    def __init__(self, info=None):
+        self.info = dict(info or {})
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class SessionFactory:
+    """Faz o papel do ``AsyncSessionLocal``."""
+
+    def __init__(self):
+        self.sessions = []
+
+    def __call__(self, info=None):
+        self.sessions.append(StubSession(info))
+        return self.sessions[-1]
+
+
+@pytest.fixture
+def pools(monkeypatch):
+    """Primário com folga; réplica usável e sem folga nenhuma."""
+    metrics = PoolMetrics()
+    metrics.pool = StubPool(free=10)
+    monitor = ReplicaMonitor()
+    monitor.engine = type('Engine', (), {'pool': StubPool(free=0)})()
+    monitor.available = True
+    factory = SessionFactory()
+    monkeypatch.setattr(paginator_module, 'pool_metrics', metrics)
+    monkeypatch.setattr(paginator_module, 'replica_monitor', monitor)
+    monkeypatch.setattr(paginator_module, 'AsyncSessionLocal', factory)
+    return metrics, monitor, factory
+
+
+def together(session, first, second):
+    paginator = Paginator(session, PaginationParams())
+    return asyncio.run(paginator._together(first, second))
+
+
+def test_runs_both_queries_at_once_with_headroom(pools):
+    metrics, _, factory = pools
+    session = StubSession()
+    both_running = asyncio.Event()
+    seen = []
+
+    async def first(current):
+        seen.append(current)
+        # Só termina se a outra consulta já estiver rodando
+        await asyncio.wait_for(both_running.wait(), timeout=1)
+        return 'page'
+
+    async def second(current):
+        seen.append(current)
+        both_running.set()
+        return 42
+
+    assert together(session, first, second) == ('page', 42)
+    (other,) = factory.sessions
+    assert seen == [session, other]
+    assert metrics.concurrent == 1
+    assert metrics.sequential == 0
+
+
+def test_falls_back_to_one_session_without_headroom(pools):
+    metrics, _, factory = pools
+    metrics.pool = StubPool(free=1)
+    session = StubSession()
+    order = []
+
+    async def first(current):
+        order.append(('first', current))
+        return 'page'
+
+    async def second(current):
+        order.append(('second', current))
+        return 42
+
+    assert together(session, first, second) == ('page', 42)
+    assert order == [('first', session), ('second', session)]
+    assert factory.sessions == []
+    assert metrics.sequential == 1
+
+
+def test_replica_reads_measure_the_replica_pool(pools):
+    metrics, monitor, factory = pools
+
+    async def query(current):
+        return current.info
+
+    replica_read = StubSession({'read_replica': True})
+    together(replica_read, query, query)
+    assert metrics.sequential == 1
+
+    # Réplica fora de uso: as duas leem do primário, que tem folga
+    monitor.available = False
+    together(replica_read, query, query)
+    assert metrics.concurrent == 1
+    assert factory.sessions[0].info == {'read_replica': True}
+
+
+def test_first_error_surfaces_and_cancels_the_other(pools):
+    cancelled = asyncio.Event()
+
+    async def first(current):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def second(current):
+        raise LookupError('count failed')
+
+    with pytest.raises(LookupError, match='count failed'):
+        together(StubSession(), first, second)
+    assert cancelled.is_set()
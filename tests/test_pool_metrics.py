@@ -0,0 +1,130 @@
+import asyncio
+import logging
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.util import greenlet_spawn
+
+from app.core.utils import pool_metrics as metrics_module
+from app.core.utils.pool_metrics import (
+    PoolMetrics,
+    StatementMetrics,
+    TimedQueuePool,
+)
+
+
+class StubPool:
+    """Só os contadores que o PoolMetrics lê."""
+
+    def __init__(self, size, checkedout, overflow=-1):
+        self._size = size
+        self._checkedout = checkedout
+        self._overflow = overflow
+
+    def size(self):
+        return self._size
+
+    def checkedout(self):
+        return self._checkedout
+
+    def checkedin(self):
+        return max(self._size - self._checkedout, 0)
+
+    def overflow(self):
+        return self._overflow
+
+
+class StubConnection:
+    """Conexão DBAPI mínima para o pool real."""
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_histogram_is_cumulative():
+    metrics = PoolMetrics(warning_ms=1000)
+    for wait_ms in (0.5, 3, 3, 40, 9000):
+        metrics.observe(wait_ms)
+
+    stats = metrics.stats()
+
+    assert stats['checkouts'] == 5
+    assert stats['wait_ms_max'] == 9000
+    assert stats['wait_ms_avg'] == round((0.5 + 3 + 3 + 40 + 9000) / 5, 3)
+    buckets = stats['wait_ms_buckets']
+    assert buckets['1'] == 1
+    assert buckets['5'] == 3
+    assert buckets['25'] == 3
+    assert buckets['50'] == 4
+    assert buckets['5000'] == 4
+    assert buckets['+Inf'] == 5
+
+
+def test_slow_checkout_is_counted_and_logged(caplog):
+    metrics = PoolMetrics(warning_ms=100)
+
+    with caplog.at_level(logging.WARNING):
+        metrics.observe(99)
+        metrics.observe(150)
+
+    assert metrics.slow == 1
+    assert 'Waited 150.0 ms' in caplog.text
+
+
+def test_headroom_counts_overflow_capacity():
+    metrics = PoolMetrics()
+    assert metrics.headroom() == 0
+    assert metrics.gauges() == {}
+
+    metrics.pool = StubPool(size=5, checkedout=6, overflow=1)
+    metrics.max_overflow = 10
+
+    assert metrics.headroom() == 9
+    assert metrics.gauges() == {
+        'size': 5,
+        'in_use': 6,
+        'idle': 0,
+        'overflow': 1,
+    }
+
+
+def test_timed_pool_measures_waits_and_timeouts(monkeypatch):
+    metrics = PoolMetrics()
+    monkeypatch.setattr(metrics_module, 'pool_metrics', metrics)
+    pool = TimedQueuePool(
+        StubConnection, pool_size=1, max_overflow=0, timeout=0.01
+    )
+
+    async def main():
+        held = await greenlet_spawn(pool.connect)
+        with pytest.raises(PoolTimeoutError):
+            await greenlet_spawn(pool.connect)
+        await greenlet_spawn(held.close)
+        # Devolvida ao pool: o próximo checkout não espera
+        again = await greenlet_spawn(pool.connect)
+        await greenlet_spawn(again.close)
+
+    asyncio.run(main())
+
+    assert metrics.count == 2
+    assert metrics.timeouts == 1
+
+
+def test_statement_metrics_reads_prepared_caches_on_checkin():
+    metrics = StatementMetrics()
+    first, second = object(), object()
+    connection = type('Connection', (), {})()
+
+    connection._prepared_statement_cache = {'a': 1, 'b': 2}
+    metrics._on_checkin(connection, first)
+    connection._prepared_statement_cache = {'a': 1}
+    metrics._on_checkin(connection, second)
+
+    assert metrics.stats()['prepared_total'] == 3
+    assert metrics.stats()['prepared_max_per_connection'] == 2
+
+    metrics._on_close(connection, first)
+    assert metrics.stats()['prepared_total'] == 1
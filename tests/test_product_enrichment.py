@@ -0,0 +1,80 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.core.utils.count_cache import count_cache
+from app.core.utils.paginator import TOTAL_KEY
+from app.repositories.products_repositories import (
+    get_enrichment_passes,
+    reset_enrichment_passes,
+)
+from app.schemas.pagination import PaginationParams
+from app.service.product import ProductsService
+
+PRODUCT = {
+    'id': 1,
+    'description': 'corte',
+    'value_operation': 40.0,
+    'time_to_spend': '00:30:00',
+    'commission': 10.0,
+    'category': 'cabelo',
+    'image_path': 'static/uploads/2024/01/10/product_images_corte/a.jpg',
+}
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return [SimpleNamespace(_mapping=row) for row in self.rows]
+
+    def mappings(self):
+        return self
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+
+class FakeSession:
+    """Devolve as mesmas linhas para qualquer consulta."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.info = {}
+
+    async def execute(self, stmt, params=None):
+        return FakeResult([dict(row) for row in self.rows])
+
+
+def run_in_request(coroutine_fn):
+    """Roda como uma requisição: contexto novo, contador zerado."""
+
+    async def request():
+        reset_enrichment_passes()
+        result = await coroutine_fn()
+        return result, get_enrichment_passes()
+
+    return asyncio.run(request())
+
+
+def test_list_products_enriches_once():
+    count_cache.invalidate('products')
+    service = ProductsService(FakeSession([{**PRODUCT, TOTAL_KEY: 1}]))
+
+    (products, metadata), passes = run_in_request(
+        lambda: service.list_products(PaginationParams())
+    )
+
+    assert passes == 1
+    assert metadata.total_count == 1
+    assert products[0]['image_url'].endswith(PRODUCT['image_path'])
+    assert 'image_path' not in products[0]
+
+
+def test_get_product_enriches_once():
+    service = ProductsService(FakeSession([PRODUCT]))
+
+    product, passes = run_in_request(lambda: service.get_product(1))
+
+    assert passes == 1
+    assert product['image_url'].endswith(PRODUCT['image_path'])
@@ -0,0 +1,46 @@
+import asyncio
+
+from app.repositories import products_repositories
+from app.repositories.products_repositories import ProductRepositories
+
+
+class UpdatingSession:
+    """Cada UPDATE 'atualiza' metade das linhas do seu VALUES."""
+
+    def __init__(self):
+        self.statements = 0
+        self.committed = False
+
+    async def execute(self, stmt):
+        self.statements += 1
+        # Duas colunas no VALUES: descrição e caminho
+        rows = list(range(len(stmt.compile().params) // 2))
+        return type('Result', (), {'all': lambda _: rows[::2]})()
+
+    async def commit(self):
+        self.committed = True
+
+
+def test_backfill_counts_returned_rows_per_batch(monkeypatch):
+    monkeypatch.setattr(products_repositories, 'BACKFILL_BATCH_SIZE', 4)
+    session = UpdatingSession()
+    images = {f'produto-{n}': f'static/uploads/{n}.jpg' for n in range(10)}
+
+    total = asyncio.run(
+        ProductRepositories(session).backfill_image_paths(images)
+    )
+
+    # Lotes de 4, 4 e 2 linhas; metade de cada volta no RETURNING
+    assert session.statements == 3
+    assert total == 2 + 2 + 1
+    assert session.committed
+
+
+def test_backfill_without_images_skips_the_database():
+    session = UpdatingSession()
+
+    assert (
+        asyncio.run(ProductRepositories(session).backfill_image_paths({}))
+        == 0
+    )
+    assert session.statements == 0
@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy import create_engine, select, text, update
+
+from app.db import db
+from app.db.db import RoutingSession
+from app.db.replica import ReplicaMonitor
+from app.models.users import User
+
+primary = create_engine('sqlite://')
+replica = create_engine('sqlite://')
+
+
+class StubAsyncEngine:
+    """Só o ``sync_engine`` que o RoutingSession devolve."""
+
+    sync_engine = replica
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    monitor = ReplicaMonitor()
+    monitor.engine = StubAsyncEngine()
+    monitor.available = True
+    monkeypatch.setattr(db, 'replica_monitor', monitor)
+    monkeypatch.setattr(db, 'replica_engine', StubAsyncEngine())
+    return monitor
+
+
+def routing_session(read_replica=True) -> RoutingSession:
+    return RoutingSession(
+        bind=primary, info={'read_replica': read_replica}
+    )
+
+
+def test_reads_go_to_the_replica(monitor):
+    session = routing_session()
+
+    assert session.get_bind(clause=select(User.id)) is replica
+    assert monitor.reads == 1
+
+
+def test_sessions_without_the_flag_stay_on_the_primary(monitor):
+    session = routing_session(read_replica=None)
+
+    assert session.get_bind(clause=select(User.id)) is primary
+    assert monitor.reads == 0
+
+
+@pytest.mark.parametrize(
+    'clause',
+    [
+        select(User.id).with_for_update(),
+        text('SELECT 1'),
+    ],
+    ids=['for_update', 'raw_sql'],
+)
+def test_locking_and_raw_reads_stay_on_the_primary(monitor, clause):
+    session = routing_session()
+
+    assert session.get_bind(clause=clause) is primary
+    assert session.info['read_replica']
+
+
+def test_lagging_replica_falls_back_to_the_primary(monitor):
+    monitor.available = False
+    session = routing_session()
+
+    assert session.get_bind(clause=select(User.id)) is primary
+    assert monitor.fallbacks == 1
+    assert monitor.reads == 0
+
+
+def test_after_a_write_the_session_reads_the_primary(monitor):
+    session = routing_session()
+
+    write = update(User).values(is_deleted=True)
+    assert session.get_bind(clause=write) is primary
+    assert session.get_bind(clause=select(User.id)) is primary
+    assert session.info['read_replica'] is False
+    assert monitor.reads == 0
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.repositories.schedule_repositories import (
+    is_month_crossing,
+    spans_months,
+)
+
+HALF_HOUR = timedelta(minutes=30)
+
+
+@pytest.mark.parametrize(
+    ('start', 'expected'),
+    [
+        (datetime(2026, 10, 31, 23, 0), False),
+        # Termina exatamente à meia-noite: ainda é outubro
+        (datetime(2026, 10, 31, 23, 30), False),
+        (datetime(2026, 10, 31, 23, 45), True),
+        (datetime(2026, 12, 31, 23, 45), True),
+        (datetime(2026, 11, 1, 0, 0), False),
+    ],
+)
+def test_spans_months_matches_the_check(start, expected):
+    assert spans_months(start, start + HALF_HOUR) is expected
+
+
+class CheckViolation(Exception):
+    sqlstate = '23514'
+
+
+def test_month_crossing_error_is_recognized():
+    error = type('DBAPIError', (Exception,), {})()
+    error.orig = CheckViolation(
+        'new row for relation "schedule_y2026m10" violates check '
+        'constraint "ck_schedule_single_month"'
+    )
+
+    assert is_month_crossing(error)
+    assert not is_month_crossing(Exception('other'))
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from app.core.utils.singleflight import SingleFlight
+
+KEY = ('employee-1', '2026-10-19', 30)
+
+
+def counted(calls, result='slots', delay=0.01):
+    async def fn():
+        calls.append(result)
+        await asyncio.sleep(delay)
+        return result
+
+    return fn
+
+
+def test_concurrent_calls_share_one_execution():
+    async def main():
+        flight, calls = SingleFlight(), []
+        results = await asyncio.gather(
+            *(flight.do(KEY, counted(calls)) for _ in range(10))
+        )
+        return flight, calls, results
+
+    flight, calls, results = asyncio.run(main())
+
+    assert calls == ['slots']
+    assert results == ['slots'] * 10
+    assert flight.stats()['hits'] == 9
+    assert flight.stats()['inflight'] == 0
+
+
+def test_result_reused_until_invalidated():
+    async def main():
+        flight, calls = SingleFlight(reuse_seconds=60), []
+        await flight.do(KEY, counted(calls))
+        await flight.do(KEY, counted(calls))
+        flight.invalidate('employee-1')
+        await flight.do(KEY, counted(calls))
+        return calls
+
+    assert asyncio.run(main()) == ['slots', 'slots']
+
+
+def test_invalidate_during_flight_discards_result():
+    async def main():
+        flight, calls = SingleFlight(reuse_seconds=60), []
+        leader = asyncio.create_task(flight.do(KEY, counted(calls)))
+        await asyncio.sleep(0)
+        flight.invalidate('employee-1')
+        await leader
+        await flight.do(KEY, counted(calls))
+        return calls
+
+    assert asyncio.run(main()) == ['slots', 'slots']
+
+
+def test_errors_reach_followers():
+    async def main():
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError('boom')
+
+        return await asyncio.gather(
+            flight.do(KEY, fail),
+            flight.do(KEY, fail),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(main())
+
+    assert [type(result) for result in results] == [ValueError] * 2
+
+
+def test_cancelled_leader_hands_over_to_a_follower():
+    async def main():
+        flight, calls = SingleFlight(), []
+        leader = asyncio.create_task(
+            flight.do(KEY, counted(calls, 'leader', delay=1))
+        )
+        await asyncio.sleep(0)
+        followers = [
+            asyncio.create_task(flight.do(KEY, counted(calls, name)))
+            for name in ('first', 'second')
+        ]
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return calls, await asyncio.gather(*followers)
+
+    calls, results = asyncio.run(main())
+
+    # Um seguidor assume; o outro aguarda a execução dele
+    assert calls == ['leader', 'first']
+    assert results == ['first', 'first']
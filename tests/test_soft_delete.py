@@ -0,0 +1,60 @@
+import asyncio
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.db.archive import POLICIES
+from app.repositories.employee_repositories import EmployeeRepositories
+from app.repositories.products_repositories import ProductRepositories
+from app.repositories.schedule_repositories import ScheduleRepository
+from app.repositories.service_schedule import ServiceScheduleRepository
+from app.repositories.users_repositories import UserRepositories
+
+
+def sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect()))
+
+
+class RecordingSession:
+    """Guarda o SQL executado e não devolve linhas."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(sql(stmt))
+        return type('Result', (), {'all': lambda self: []})()
+
+    async def commit(self):
+        pass
+
+
+@pytest.mark.parametrize(
+    ('repository', 'method'),
+    [
+        (UserRepositories, 'delete_users'),
+        (EmployeeRepositories, 'delete_employee'),
+        (ProductRepositories, 'delete_product'),
+        (ScheduleRepository, 'delete_schedule'),
+        (ServiceScheduleRepository, 'delete_block_schedule'),
+    ],
+)
+def test_delete_stamps_deleted_at(repository, method):
+    session = RecordingSession()
+
+    asyncio.run(getattr(repository(session), method)(uuid4()))
+
+    (statement,) = session.statements
+    assert 'is_deleted=' in statement
+    assert 'deleted_at=' in statement
+
+
+@pytest.mark.parametrize('policy', POLICIES, ids=lambda p: p.name)
+def test_retention_counts_only_from_deleted_at(policy):
+    condition = sql(policy.condition(policy.table, datetime(2026, 1, 1)))
+
+    assert 'deleted_at <' in condition
+    assert 'updated_at' not in condition
+    assert 'created_at' not in condition
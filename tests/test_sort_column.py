@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.utils.count_cache import count_cache
+from app.core.utils.paginator import mapped_sort_column
+from app.models.schedule import ScheduleService
+from app.models.users import User
+from app.repositories.users_repositories import UserRepositories
+from app.schemas.pagination import PaginationParams
+
+
+class RecordingSession:
+    """Guarda o SQL executado e não devolve linhas."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(
+            str(stmt.compile(dialect=postgresql.dialect()))
+        )
+        return type('Result', (), {'all': lambda self: []})()
+
+
+def test_mapped_sort_column_takes_the_first_model_with_it():
+    assert mapped_sort_column('id', ScheduleService, User) is (
+        ScheduleService.id
+    )
+    assert mapped_sort_column('username', ScheduleService, User) is (
+        User.username
+    )
+
+
+@pytest.mark.parametrize('order_by', ['metadata', 'registry', 'nada'])
+def test_mapped_sort_column_ignores_what_is_not_a_column(order_by):
+    assert mapped_sort_column(order_by, User) is None
+
+
+def test_cursor_list_with_invalid_order_falls_back_to_id():
+    session = RecordingSession()
+    params = PaginationParams(
+        order_by='metadata', pagination_mode='cursor'
+    )
+    # Total em cache: a página é a única consulta
+    count_cache.put('users', (None, 'contains', None), 0)
+    try:
+        asyncio.run(UserRepositories(session).list_users(params))
+    finally:
+        count_cache.invalidate('users')
+
+    (statement,) = session.statements
+    assert 'ORDER BY public."user".id ASC' in statement
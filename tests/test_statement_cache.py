@@ -0,0 +1,107 @@
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import select, union_all
+from sqlalchemy.dialects.postgresql.asyncpg import dialect
+from sqlalchemy.util import LRUCache
+
+from app.models.block import ScheduleBlock
+from app.models.product import Products
+from app.models.schedule import ScheduleService
+from app.models.users import User
+from app.repositories.login_repositories import USER_BY_PHONE
+from app.repositories.slots_repositories import (
+    BUSY_INTERVALS,
+    MAX_APPOINTMENT,
+    PRODUCT_DURATION,
+)
+
+ITERATIONS = 500
+START = datetime(2026, 10, 19, 8)
+END = START + timedelta(hours=10)
+EMPLOYEE_IDS = [uuid4() for _ in range(3)]
+
+
+# Como as consultas eram montadas a cada requisição
+def user_by_phone():
+    return select(User).where(
+        User.phone == '5561999990000', User.is_deleted == False
+    )
+
+
+def product_duration():
+    return select(Products.time_to_spend).where(
+        Products.id == EMPLOYEE_IDS[0], Products.is_deleted == False
+    )
+
+
+def busy_intervals():
+    schedules = (
+        select(
+            ScheduleService.employee_id.label('employee_id'),
+            ScheduleService.time_register.label('start'),
+            (ScheduleService.time_register + Products.time_to_spend).label(
+                'end'
+            ),
+        )
+        .join(Products, ScheduleService.product_id == Products.id)
+        .where(
+            ScheduleService.employee_id.in_(EMPLOYEE_IDS),
+            ScheduleService.is_deleted == False,
+            ScheduleService.time_register >= START - MAX_APPOINTMENT,
+            ScheduleService.time_register < END,
+        )
+    )
+    blocks = select(
+        ScheduleBlock.employee_id.label('employee_id'),
+        ScheduleBlock.start_time.label('start'),
+        ScheduleBlock.end_time.label('end'),
+    ).where(
+        ScheduleBlock.employee_id.in_(EMPLOYEE_IDS),
+        ScheduleBlock.is_deleted == False,
+        ScheduleBlock.start_time < END,
+        ScheduleBlock.end_time > START,
+    )
+    return union_all(schedules, blocks)
+
+
+def per_call_us(build) -> float:
+    """Montagem, chave de cache e busca no cache de SQL compilado, como
+    o engine faz em cada execute; sem banco."""
+    asyncpg = dialect()
+    cache = LRUCache(100)
+    build()._compile_w_cache(asyncpg, compiled_cache=cache, column_keys=[])
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        _, _, stats = build()._compile_w_cache(
+            asyncpg, compiled_cache=cache, column_keys=[]
+        )
+    elapsed = time.perf_counter() - started
+    # Toda chamada depois da primeira acha o SQL compilado no cache
+    assert stats is asyncpg.CACHE_HIT
+    return elapsed / ITERATIONS * 1_000_000
+
+
+def test_prebuilt_statements_skip_the_per_request_build():
+    """Benchmark: consulta montada por requisição x montada uma vez."""
+    queries = {
+        'user_by_phone': (user_by_phone, lambda: USER_BY_PHONE),
+        'product_duration': (product_duration, lambda: PRODUCT_DURATION),
+        'busy_intervals': (busy_intervals, lambda: BUSY_INTERVALS),
+    }
+    timings = {
+        name: (per_call_us(before), per_call_us(after))
+        for name, (before, after) in queries.items()
+    }
+    print(
+        '\n'
+        + '\n'.join(
+            f'{name}: {before:.1f} us -> {after:.1f} us'
+            for name, (before, after) in timings.items()
+        )
+    )
+
+    # Montada uma vez, a chave de cache fica memorizada no statement
+    for before, after in timings.values():
+        assert after * 3 < before